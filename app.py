@@ -1,8 +1,12 @@
 import streamlit as st
 import os
-from src.data_loader import load_resume
-from src.scoring import calculate_composite_score
+from src.data_loader import load_resume, load_jds, JD_DIR
+from src.scoring import score_all_domains, warmup, EMBEDDING_MODE
 from src.recommendations import recommend_better_domains
+from src.model_registry import registry
+from src.extraction_cache import extraction_cache, content_hash
+from src.section_extraction import extract_sections
+from src.encoder import get_encoder
 
 # Set page config
 st.set_page_config(page_title="Advanced Resume Screening", page_icon="🚀", layout="wide")
@@ -22,16 +26,94 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def load_jds():
-    jd_dir = 'data/job_descriptions'
-    jds = {}
-    if not os.path.exists(jd_dir): return {}
-    for filename in os.listdir(jd_dir):
-        if filename.endswith('.txt'):
-            domain = filename.replace('.txt', '')
-            with open(os.path.join(jd_dir, filename), 'r', encoding='utf-8') as f:
-                jds[domain] = f.read()
-    return jds
+def jd_version(jd_dir=JD_DIR):
+    """
+    Stamp of the JD files (names, mtimes and sizes); changes whenever one is
+    added, removed or edited.
+    """
+    if not os.path.isdir(jd_dir):
+        return ""
+    stamps = []
+    for entry in sorted(os.scandir(jd_dir), key=lambda e: e.name):
+        if entry.name.endswith('.txt'):
+            stat = entry.stat()
+            stamps.append(f"{entry.name}:{stat.st_mtime_ns}:{stat.st_size}")
+    return "|".join(stamps)
+
+@st.cache_resource(max_entries=4)
+def cached_jds(version):
+    # Read once per version of the JD files instead of on every rerun
+    return load_jds()
+
+@st.cache_resource
+def load_engine(domains):
+    """
+    Loads the domain models, spaCy, the sentence encoder and the JD embedding
+    index once per server process, so no session pays for them on its first analysis.
+    """
+    warmup(domains)
+    return registry
+
+def model_version(domains, jds_version):
+    # Results stay valid until a model is retrained, a JD is edited or the encoder/embedding setup changes
+    return f"{registry.version(domains)}:{get_encoder().model_id}:{EMBEDDING_MODE}:{jds_version}"
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def analyze_resume(resume_hash, domains, version, _resume_text, _sections, _jds):
+    """
+    Scores a resume against every role. Memoized on (resume hash, domain set,
+    model and JD version); the underscored arguments are derived from those
+    and are not hashed by Streamlit.
+    """
+    return score_all_domains(_resume_text, _jds, sections=_sections)
+
+def render_results(domain_results, selected_domain):
+    score, match_level, missing_skills, sections, is_fresher = domain_results[selected_domain]
+    
+    # --- RECOMMENDATIONS ENGINE (Alt Domains) ---
+    all_scores = {d: result[0] for d, result in domain_results.items()}
+    
+    better_domains = recommend_better_domains(all_scores, selected_domain)
+    
+    # --- UI LAYOUT ---
+    st.divider()
+    
+    # Top Section: Score & Level
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.write(f"**Candidate Type:** {'Fresher' if is_fresher else 'Experienced'}")
+    with col2:
+        st.metric("Selection Probability", f"{score}%", delta_color="normal")
+    with col3:
+        color = "red"
+        if "Good" in match_level: color = "orange"
+        if "Strong" in match_level: color = "green"
+        st.markdown(f"**Match Level:** :{color}[{match_level}]")
+        
+    st.progress(score / 100)
+    
+    # Middle Section: Analysis
+    c1, c2 = st.columns(2)
+    
+    with c1:
+        st.subheader("⚠️ Missing Key Skills")
+        if missing_skills:
+            for skill in missing_skills[:10]:
+                st.write(f"- ❌ {skill}")
+        else:
+            st.success("No critical skill gaps detected!")
+            
+    with c2:
+        st.subheader("💡 Better Fit Roles")
+        if better_domains:
+            for d, s in better_domains:
+                st.info(f"**{d}**: {s}% Match")
+        else:
+            st.write("This role is the best fit for you!")
+            
+    # Bottom: Section Details
+    with st.expander("View Section-wise Analysis"):
+        st.json(sections)
 
 def main():
     st.title("🚀 Smart Resume Screening System")
@@ -39,90 +121,52 @@ def main():
 
     # Sidebar
     st.sidebar.header("Configuration")
-    jds = load_jds()
+    jds_version = jd_version()
+    jds = cached_jds(jds_version)
     
     if not jds:
         st.error("No Job Descriptions found!")
         return
 
+    domains = tuple(sorted(jds.keys()))
+    load_engine(domains)
+
     selected_domain = st.sidebar.selectbox("Select Target Role", list(jds.keys()))
     
     # File Upload
     uploaded_file = st.file_uploader("Upload Resume (PDF, DOCX, TXT)", type=['pdf', 'docx', 'txt'])
+    if not uploaded_file:
+        return
+    file_bytes = uploaded_file.getvalue()
+    resume_hash = content_hash(file_bytes)
 
-    if uploaded_file and st.button("Analyze Profile"):
+    if st.button("Analyze Profile"):
         with st.spinner("Running AI Analysis..."):
-            # Save and load
-            save_folder = "data/processed_resumes"
-            os.makedirs(save_folder, exist_ok=True)
-            temp_path = os.path.join(save_folder, uploaded_file.name)
-            with open(temp_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+            # Parse straight from the upload buffer; re-uploads of the same
+            # file are served from the extraction cache
+            def extract():
+                text = load_resume(file_bytes, uploaded_file.name)
+                return text, extract_sections(text) if text else {}
                 
-            resume_text = load_resume(temp_path)
+            resume_text, resume_sections, _ = extraction_cache.get_or_extract(file_bytes, extract)
             
             if not resume_text:
                 st.error("Text extraction failed.")
                 return
                 
             # --- SCORING ENGINE ---
-            jd_text = jds[selected_domain]
-            score, match_level, missing_skills, sections, is_fresher = calculate_composite_score(resume_text, jd_text, selected_domain)
-            
-            # --- RECOMMENDATIONS ENGINE (Alt Domains) ---
-            # We need to calculate scores for ALL domains to find better fits
-            # This might be slow if we run full pipeline, so simplistic check:
-            all_scores = {selected_domain: score}
-            # For simplicity in demo, maybe we don't run full SBERT on all 10 domains unless requested
-            # Let's run it for top 3 other random or just all (if small number)
-            for d in jds:
-                if d != selected_domain:
-                    # Quick check using just ML model or simplified score? 
-                    # Let's run full for accuracy as requested
-                    s, _, _, _, _ = calculate_composite_score(resume_text, jds[d], d)
-                    all_scores[d] = s
-            
-            better_domains = recommend_better_domains(all_scores, selected_domain)
-            
-            # --- UI LAYOUT ---
-            st.divider()
-            
-            # Top Section: Score & Level
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.write(f"**Candidate Type:** {'Fresher' if is_fresher else 'Experienced'}")
-            with col2:
-                st.metric("Selection Probability", f"{score}%", delta_color="normal")
-            with col3:
-                color = "red"
-                if "Good" in match_level: color = "orange"
-                if "Strong" in match_level: color = "green"
-                st.markdown(f"**Match Level:** :{color}[{match_level}]")
-                
-            st.progress(score / 100)
-            
-            # Middle Section: Analysis
-            c1, c2 = st.columns(2)
-            
-            with c1:
-                st.subheader("⚠️ Missing Key Skills")
-                if missing_skills:
-                    for skill in missing_skills[:10]:
-                        st.write(f"- ❌ {skill}")
-                else:
-                    st.success("No critical skill gaps detected!")
-                    
-            with c2:
-                st.subheader("💡 Better Fit Roles")
-                if better_domains:
-                    for d, s in better_domains:
-                        st.info(f"**{d}**: {s}% Match")
-                else:
-                    st.write("This role is the best fit for you!")
-                    
-            # Bottom: Section Details
-            with st.expander("View Section-wise Analysis"):
-                st.json(sections)
+            # One pass over the resume scores it against every role, which the
+            # recommendations engine needs to find better fits anyway
+            domain_results = analyze_resume(resume_hash, domains, model_version(domains, jds_version),
+                                            resume_text, resume_sections, jds)
+            st.session_state["analysis"] = {"resume_hash": resume_hash, "jds_version": jds_version,
+                                            "results": domain_results}
+
+    # Results for every role are kept in the session, so switching the target
+    # role re-renders without rescoring (until the JDs change)
+    analysis = st.session_state.get("analysis")
+    if analysis and analysis["resume_hash"] == resume_hash and analysis["jds_version"] == jds_version:
+        render_results(analysis["results"], selected_domain)
                 
 if __name__ == "__main__":
     main()
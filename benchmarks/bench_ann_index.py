@@ -0,0 +1,90 @@
+"""
+Benchmark: IVF approximate nearest neighbour index vs. exact search.
+
+Builds an index of n normalized vectors (incrementally, in batches, the
+way the candidate store fills it) and, for a set of held-out queries,
+reports recall@k against exact brute-force search plus query latency for
+several nprobe settings. Vectors are drawn around random cluster centres
+(MiniLM-sized by default); --resumes embeds that many synthetic resumes
+with the sentence encoder instead.
+
+Usage:
+    python benchmarks/bench_ann_index.py [--n 200000] [--dim 384] [--k 10] [--queries 200]
+    python benchmarks/bench_ann_index.py --resumes 20000
+"""
+import os
+import sys
+import time
+import shutil
+import random
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ann_index import IVFIndex
+
+def clustered_vectors(n, dim, n_clusters, rng):
+    centres = rng.normal(size=(n_clusters, dim)).astype(np.float32)
+    return centres[rng.integers(0, n_clusters, n)] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+
+def resume_vectors(n):
+    from src.data_loader import load_jds
+    from src.encoder import get_encoder
+    from src.model_training import perturb_text
+    jds = list(load_jds().values())
+    random.seed(0)
+    texts = [perturb_text(random.choice(jds), noise_level=random.uniform(0.2, 0.7)) for _ in range(n)]
+    return get_encoder().encode_many(texts)
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall@k and latency of the IVF index.")
+    parser.add_argument("--n", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200, help="Cluster centres of the synthetic vectors")
+    parser.add_argument("--resumes", type=int, default=None, help="Embed this many synthetic resumes instead")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--batch", type=int, default=5000, help="Vectors per add() call")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.resumes:
+        vectors = resume_vectors(args.resumes + args.queries)
+    else:
+        vectors = clustered_vectors(args.n + args.queries, args.dim, args.clusters, rng)
+    data, queries = vectors[:-args.queries], vectors[-args.queries:]
+
+    index_dir = tempfile.mkdtemp(prefix="ann-bench-")
+    try:
+        index = IVFIndex(index_dir)
+        start = time.perf_counter()
+        for first in range(0, len(data), args.batch):
+            index.add(np.arange(first, min(first + args.batch, len(data))), data[first:first + args.batch])
+        build_s = time.perf_counter() - start
+        start = time.perf_counter()
+        index = IVFIndex(index_dir)
+        open_ms = (time.perf_counter() - start) * 1000
+        print(f"{len(index)} vectors x {data.shape[1]}, {index.n_lists} lists: "
+              f"built in {build_s:.1f}s, reopened in {open_ms:.0f} ms")
+
+        start = time.perf_counter()
+        exact = [set(index.search(q, args.k, exact=True)[0]) for q in queries]
+        exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+        print(f"{'search':12} {'recall@' + str(args.k):>10} {'ms/query':>10} {'speedup':>8}")
+        print(f"{'exact':12} {1.0:10.3f} {exact_ms:10.2f} {1.0:8.1f}")
+        for nprobe in args.nprobe:
+            if nprobe > index.n_lists:
+                continue
+            start = time.perf_counter()
+            found = [set(index.search(q, args.k, nprobe=nprobe)[0]) for q in queries]
+            ms = (time.perf_counter() - start) / len(queries) * 1000
+            recall = np.mean([len(f & e) / len(e) for f, e in zip(found, exact)])
+            print(f"{'nprobe=' + str(nprobe):12} {recall:10.3f} {ms:10.2f} {exact_ms / ms:8.1f}")
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
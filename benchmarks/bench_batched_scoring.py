@@ -0,0 +1,77 @@
+"""
+Benchmark: one predict_proba call per text vs. one batched call per domain.
+
+Scores synthetic resumes against every trained domain with both the old
+per-text path (full text + one call per section) and scoring.predict_probas,
+checks the probabilities are identical and reports the per-resume speedup.
+
+Usage:
+    python benchmarks/bench_batched_scoring.py [n_resumes]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.model_registry import registry, available_domains
+from src.section_extraction import extract_sections
+from src.scoring import predict_probas, get_section_weights
+
+SAMPLE_RESUME = """
+Jane Doe
+Technical Skills
+Python, SQL, Machine Learning, Pandas, NumPy, Tableau, Excel, Power BI
+Experience
+Data Analyst at Acme Corp, 3 years. Built dashboards and forecasting models.
+Projects
+Customer churn prediction using scikit-learn and XGBoost.
+Education
+B.Tech Computer Science
+Certifications
+AWS Certified Cloud Practitioner
+"""
+
+def per_text_probas(model, resume_text, sections):
+    # The pre-batching behaviour: one predict_proba call per text
+    ml_proba = model.predict_proba([resume_text])[0][1]
+    section_probs = {}
+    for section, weight in get_section_weights(sections["is_fresher"]).items():
+        text = sections.get(section, "")
+        if weight != 0 and text.strip():
+            section_probs[section] = model.predict_proba([text])[0][1]
+    return ml_proba, section_probs
+
+def main(n_resumes=20):
+    domains = available_domains()
+    if not domains:
+        print("No trained models found in models/.")
+        return
+    registry.warm(domains)
+    models = [registry.get(d) for d in domains]
+    
+    resumes = [SAMPLE_RESUME + f"\nReference {i}" for i in range(n_resumes)]
+    parsed = [(r, extract_sections(r)) for r in resumes]
+    
+    # Warm-up (spaCy, sklearn internals)
+    for model in models:
+        per_text_probas(model, *parsed[0])
+        predict_probas(model, *parsed[0])
+        
+    start = time.perf_counter()
+    old = [[per_text_probas(m, r, s) for m in models] for r, s in parsed]
+    old_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    new = [[predict_probas(m, r, s) for m in models] for r, s in parsed]
+    new_time = time.perf_counter() - start
+    
+    identical = old == new
+    print(f"Domains: {len(domains)}, resumes: {n_resumes}")
+    print(f"Per-text calls : {old_time / n_resumes * 1000:8.1f} ms/resume")
+    print(f"Batched calls  : {new_time / n_resumes * 1000:8.1f} ms/resume")
+    print(f"Speedup        : {old_time / new_time:8.2f}x")
+    print(f"Identical probabilities: {identical}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,96 @@
+"""
+Benchmark: searching a stored candidate pool against a new job description.
+
+Fills a temporary candidate store with synthetic resumes (perturbed copies
+of every role's JD under a few section headings), then for each role's JD
+times the cheap prefilter (inverted skill index + one matrix-vector
+product) and the full search (prefilter + one score_batch over the
+shortlist). Exhaustive reranking of the whole pool is timed on a sample and
+extrapolated; on pools up to --exhaustive candidates it is also run in
+full to report how many of its top-k the shortlist search finds.
+
+Usage:
+    python benchmarks/bench_candidate_search.py [--pool 5000] [--top-k 10] [--shortlist 50] [--exhaustive 300]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_loader import load_jds
+from src.candidate_store import CandidateStore
+from src.model_training import perturb_text
+from src.parsed_resume import ParsedResume
+from src.scoring import calculate_composite_score, warmup
+
+def synthetic_resume(jds, rng):
+    domain = rng.choice(list(jds))
+    state = random.getstate()
+    random.seed(rng.random())
+    body = perturb_text(jds[domain], noise_level=rng.uniform(0.2, 0.6))
+    random.setstate(state)
+    words = body.split()
+    third = max(len(words) // 3, 1)
+    years = f"{rng.randint(1, 9)} years" if rng.random() < 0.6 else "Fresher"
+    return (f"Candidate\nSkills\n{' '.join(words[:third])}\nExperience\n{years} {' '.join(words[third:2 * third])}\n"
+            f"Projects\n{' '.join(words[2 * third:])}\n")
+
+def exhaustive(store, jd_text, domain, ids, top_k):
+    stored = store._load_candidates(ids)
+    scores = {cid: calculate_composite_score(ParsedResume(text, sections), jd_text, domain)[0]
+              for cid, (_, text, sections) in stored.items()}
+    return sorted(scores, key=scores.get, reverse=True)[:top_k]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark candidate search.")
+    parser.add_argument("--pool", type=int, default=5000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--shortlist", type=int, default=50)
+    parser.add_argument("--exhaustive", type=int, default=300, help="Largest pool reranked exhaustively for recall")
+    args = parser.parse_args()
+
+    jds = load_jds()
+    if not jds:
+        print("No Job Descriptions found!")
+        return
+    warmup(jds.keys())
+    rng = random.Random(0)
+    store_dir = tempfile.mkdtemp(prefix="candidate-bench-")
+    try:
+        store = CandidateStore(store_dir)
+        start = time.perf_counter()
+        store.add_resumes((f"synthetic-{i}", synthetic_resume(jds, rng)) for i in range(args.pool))
+        print(f"Added {len(store)} candidates in {time.perf_counter() - start:.1f}s")
+        all_ids = [cid for (cid,) in store.db.execute("SELECT id FROM candidates")]
+
+        sample = all_ids[:20]
+        print(f"{'role':28} {'prefilter ms':>13} {'search ms':>10} {'exhaustive s (est.)':>20} {'top-k found':>12}")
+        for domain, jd_text in jds.items():
+            start = time.perf_counter()
+            store.prefilter(jd_text, args.shortlist)
+            prefilter_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            found = [r["candidate_id"] for r in store.search(jd_text, args.top_k, domain, args.shortlist)]
+            search_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            exhaustive(store, jd_text, domain, sample, args.top_k)
+            full_s = (time.perf_counter() - start) / len(sample) * len(all_ids)
+
+            recall = ""
+            if len(all_ids) <= args.exhaustive:
+                best = exhaustive(store, jd_text, domain, all_ids, args.top_k)
+                recall = f"{len(set(best) & set(found))}/{len(best)}"
+            print(f"{domain:28} {prefilter_ms:13.1f} {search_ms:10.1f} {full_s:20.1f} {recall:>12}")
+        store.close()
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: fp32 vs. int8 dynamically quantized MiniLM encoder.
+
+Encodes the job descriptions plus synthetic resumes with both encoder modes
+and reports latency per text and how far the int8 embeddings (and the
+resume/JD similarities built from them) drift from fp32.
+
+Usage:
+    python benchmarks/bench_encoder.py [n_resumes] [batch_size] [num_threads]
+"""
+import os
+import sys
+import glob
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.encoder import Encoder
+
+def load_texts(n_resumes):
+    jds = [open(p, encoding='utf-8').read() for p in sorted(glob.glob('data/job_descriptions/*.txt'))]
+    words = " ".join(jds).split()
+    rng = np.random.default_rng(0)
+    resumes = [" ".join(rng.choice(words, size=200)) for _ in range(n_resumes)]
+    return jds, resumes
+
+def normalize(matrix):
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+def timed_encode(encoder, texts, batch_size):
+    encoder.encode_many(texts[:2], batch_size) # load + warm up
+    start = time.perf_counter()
+    embeddings = encoder.encode_many(texts, batch_size)
+    return embeddings, time.perf_counter() - start
+
+def main(n_resumes=64, batch_size=32, num_threads=None):
+    jds, resumes = load_texts(n_resumes)
+    texts = jds + resumes
+    
+    fp32 = Encoder(batch_size=batch_size, num_threads=num_threads)
+    int8 = Encoder(batch_size=batch_size, num_threads=num_threads, quantize=True)
+    emb_fp32, t_fp32 = timed_encode(fp32, texts, batch_size)
+    emb_int8, t_int8 = timed_encode(int8, texts, batch_size)
+    
+    emb_fp32, emb_int8 = normalize(emb_fp32), normalize(emb_int8)
+    self_sim = np.sum(emb_fp32 * emb_int8, axis=1)
+    n_jds = len(jds)
+    sims_fp32 = emb_fp32[n_jds:] @ emb_fp32[:n_jds].T
+    sims_int8 = emb_int8[n_jds:] @ emb_int8[:n_jds].T
+    drift = np.abs(sims_fp32 - sims_int8)
+    same_best = np.mean(sims_fp32.argmax(axis=1) == sims_int8.argmax(axis=1))
+    
+    print(f"Texts: {len(texts)}, batch size: {batch_size}, threads: {num_threads or 'default'}")
+    print(f"fp32 : {t_fp32 / len(texts) * 1000:7.2f} ms/text")
+    print(f"int8 : {t_int8 / len(texts) * 1000:7.2f} ms/text  ({t_fp32 / t_int8:.2f}x)")
+    print(f"fp32 vs int8 embedding cosine : min {self_sim.min():.4f}, mean {self_sim.mean():.4f}")
+    print(f"Resume/JD similarity drift    : mean {drift.mean():.4f}, max {drift.max():.4f}")
+    print(f"Same best-matching JD         : {same_best:.1%}")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,81 @@
+"""
+Benchmark: cold import cost of the scoring modules.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+reports the module's cumulative import time (median of several runs) with
+the heaviest packages it pulls in. With --rev, the same measurement is taken
+on a git revision (extracted to a temporary directory) for comparison.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --rev HEAD~1 --module src.scoring --runs 5
+"""
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def import_times(cwd, module):
+    """
+    Returns {module name: cumulative microseconds} for one cold import, for
+    the module itself and every top-level package imported along the way.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([cwd] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=cwd, env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"import {module} failed in {cwd}:\n{out.stderr[-2000:]}")
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if name == module or "." not in name:
+            times[name] = max(times.get(name, 0), int(cumulative))
+    return times
+
+def measure(cwd, module, runs):
+    results = [import_times(cwd, module) for _ in range(runs)]
+    total = median(r.get(module, 0) for r in results)
+    heaviest = sorted(results[-1].items(), key=lambda kv: kv[1], reverse=True)
+    return total, [(name, t) for name, t in heaviest if name not in (module, module.split(".")[0])][:8]
+
+def report(label, total, heaviest):
+    print(f"{label}: import {total / 1000:8.1f} ms")
+    for name, t in heaviest:
+        print(f"    {name:40} {t / 1000:8.1f} ms")
+
+def checkout(rev):
+    tmp = tempfile.mkdtemp(prefix="import-bench-")
+    archive = subprocess.run(["git", "archive", rev], cwd=ROOT, capture_output=True, check=True)
+    subprocess.run(["tar", "-x", "-C", tmp], input=archive.stdout, check=True)
+    return tmp
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time.")
+    parser.add_argument("--module", default="src.scoring")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--rev", help="Also measure this git revision, e.g. HEAD~1")
+    args = parser.parse_args()
+
+    if args.rev:
+        tree = checkout(args.rev)
+        try:
+            before = measure(tree, args.module, args.runs)
+        finally:
+            shutil.rmtree(tree, ignore_errors=True)
+        report(f"{args.rev:>10}", *before)
+    after = measure(ROOT, args.module, args.runs)
+    report(f"{'working tree':>10}", *after)
+    if args.rev:
+        print(f"Speedup: {before[0] / max(after[0], 1):.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: calibrated Random Forest vs. the fast linear model family.
+
+For every role, both families are trained on synthetic resumes from
+generate_synthetic_data and evaluated on a separately generated test set
+(accuracy and ROC AUC), then timed on predict_proba for a single resume
+and for a batch. The forest's spaCy preprocessing is warmed first, so its
+timings are the model's own cost; the linear family runs clean_text inside
+predict_proba, so its timings include its whole front end.
+
+Usage:
+    python benchmarks/bench_linear_models.py [n_samples] [batch_size]
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.metrics import accuracy_score, roc_auc_score
+from src.data_loader import load_jds
+from src.model_training import generate_synthetic_data, build_model, build_linear_model, _set_forest_n_jobs
+from src.preprocessing import preprocess_texts
+
+def time_predict(model, texts, repeats=5):
+    model.predict_proba(texts)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.predict_proba(texts)
+    return (time.perf_counter() - start) / repeats * 1000
+
+def main(n_samples=50, batch_size=256):
+    jds = load_jds()
+    if not jds:
+        print("No Job Descriptions found!")
+        return
+    random.seed(0)
+
+    totals = {"forest": [0, 0, 0, 0], "linear": [0, 0, 0, 0]}
+    print(f"{'role':28} {'model':7} {'acc':>6} {'auc':>6} {'1 resume ms':>12} {f'{batch_size} resumes ms':>16}")
+    for domain, jd_text in jds.items():
+        other_jds = [text for d, text in jds.items() if d != domain]
+        X_train, y_train = generate_synthetic_data(jd_text, other_jds, n_samples)
+        X_test, y_test = generate_synthetic_data(jd_text, other_jds, n_samples)
+        batch = (X_test * (batch_size // len(X_test) + 1))[:batch_size]
+        preprocess_texts(X_train + X_test)
+
+        forest = build_model()
+        forest.fit(X_train, y_train)
+        _set_forest_n_jobs(forest[-1], None)
+        linear = build_linear_model()
+        linear.fit(X_train, y_train)
+
+        for name, model in (("forest", forest), ("linear", linear)):
+            proba = model.predict_proba(X_test)[:, 1]
+            acc = accuracy_score(y_test, proba >= 0.5)
+            auc = roc_auc_score(y_test, proba)
+            single = time_predict(model, X_test[:1])
+            batched = time_predict(model, batch)
+            for i, value in enumerate((acc, auc, single, batched)):
+                totals[name][i] += value
+            print(f"{domain:28} {name:7} {acc:6.3f} {auc:6.3f} {single:12.2f} {batched:16.2f}")
+
+    print("\nMean over roles:")
+    for name, values in totals.items():
+        acc, auc, single, batched = (v / len(jds) for v in values)
+        print(f"{name:7} acc {acc:.3f}  auc {auc:.3f}  {single:8.2f} ms/resume  "
+              f"{batched / batch_size * 1000:8.1f} us/resume batched")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
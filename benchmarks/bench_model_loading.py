@@ -0,0 +1,100 @@
+"""
+Benchmark: loading the domain models from pickles vs. the compact export.
+
+Each format is measured in a fresh interpreter: wall time to load every
+domain model and the resident memory they add. RSS is read right before and
+right after loading, with sklearn imported and spaCy loaded beforehand, so
+only the models are counted; a second figure adds the pages the first
+predictions touch (the compact arrays are memory-mapped and only read in
+on use). Also checks the compact models give the same probabilities as the
+pickles and times predict_proba.
+
+Usage:
+    python benchmarks/bench_model_loading.py [--export]
+
+--export (re)writes models/compact from the current pickles first.
+"""
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+SAMPLE_RESUME = """
+Jane Doe
+Technical Skills
+Python, SQL, Machine Learning, Pandas, NumPy, Tableau, Excel, Power BI
+Experience
+Data Analyst at Acme Corp, 3 years. Built dashboards and forecasting models.
+Projects
+Customer churn prediction using scikit-learn and XGBoost.
+"""
+
+CHILD = r"""
+import os, sys, json, time
+sys.path.insert(0, os.getcwd())
+import numpy as np
+import src.model_training as mt
+from src.compact_model import CompactModel
+from src.model_registry import available_domains
+from src.preprocessing import preprocess_text
+# Everything besides the models themselves, loaded before the first RSS reading
+import sklearn.pipeline, sklearn.feature_extraction.text, sklearn.ensemble, sklearn.calibration
+preprocess_text("warm up spaCy")
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+fmt, texts = sys.argv[1], json.loads(sys.argv[2])
+domains = available_domains()
+mt.MODEL_FORMAT = fmt
+rss_before = rss_kb()
+start = time.perf_counter()
+models = [mt.load_model(d) for d in domains]
+load_s = time.perf_counter() - start
+rss_loaded = rss_kb()
+# Touch every page the first prediction needs, then time steady-state calls
+probas = [m.predict_proba(texts)[:, 1].tolist() for m in models]
+rss_used = rss_kb()
+start = time.perf_counter()
+for _ in range(5):
+    for m in models:
+        m.predict_proba(texts)
+predict_ms = (time.perf_counter() - start) / 5 * 1000
+print(json.dumps({"load_ms": load_s * 1000, "rss_mb": (rss_loaded - rss_before) / 1024,
+                  "rss_used_mb": (rss_used - rss_before) / 1024,
+                  "predict_ms": predict_ms, "probas": probas, "domains": len(domains)}))
+"""
+
+def measure(fmt, texts):
+    out = subprocess.run([sys.executable, "-c", CHILD, fmt, json.dumps(texts)],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    os.chdir(ROOT)
+    if "--export" in sys.argv or not os.path.isdir("models/compact"):
+        from src.model_training import export_compact_models
+        print(f"Exported: {', '.join(export_compact_models())}")
+
+    from src.section_extraction import extract_sections
+    sections = extract_sections(SAMPLE_RESUME)
+    texts = [SAMPLE_RESUME] + [sections[s] for s in ("skills", "experience", "projects") if sections[s].strip()]
+
+    pickled = measure("per_domain", texts)
+    compact = measure("compact", texts)
+    drift = max(abs(a - b) for pa, pb in zip(pickled["probas"], compact["probas"]) for a, b in zip(pa, pb))
+
+    print(f"Domains: {pickled['domains']}")
+    print(f"{'':10} {'load ms':>10} {'RSS MB':>10} {'+ predict':>10} {'predict ms':>12}")
+    for name, r in (("pickle", pickled), ("compact", compact)):
+        print(f"{name:10} {r['load_ms']:10.1f} {r['rss_mb']:10.1f} {r['rss_used_mb']:10.1f} {r['predict_ms']:12.1f}")
+    print(f"Max probability difference: {drift:.2e}")
+
+if __name__ == "__main__":
+    main()
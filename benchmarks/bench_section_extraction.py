@@ -0,0 +1,94 @@
+"""
+Benchmark: single-pass section extraction vs. the previous per-pattern scans.
+
+Builds large synthetic resumes (many repeated sections, long bodies and
+plenty of experience durations), checks the single-pass extractor returns
+exactly what the old implementation did, and times both, plus
+find_sections alone (offsets only, no section text materialized).
+
+Usage:
+    python benchmarks/bench_section_extraction.py [n_resumes] [sections_per_resume]
+"""
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.section_extraction import extract_sections, find_sections
+
+HEADINGS = ["Technical Skills", "Skills", "Core Competencies", "Work Experience", "Professional Experience",
+            "Employment History", "Projects", "Academic Projects", "Education", "Academic Background",
+            "Certifications", "Licenses"]
+FILLER = ("python sql tableau excel machine learning dashboards stakeholders forecasting pipelines "
+          "spark airflow docker kubernetes react node aws gcp statistics reporting analysis").split()
+
+def reference_extract_sections(resume_text):
+    # The implementation before the single-pass scan: one finditer per section
+    # pattern over the lowercased text, then a sort of all heading matches
+    text = resume_text.lower()
+    patterns = {
+        "skills": r"\b(skills|technical skills|core competencies|expertise)\b",
+        "experience": r"\b(experience|work experience|professional experience|employment history)\b",
+        "projects": r"\b(projects|academic projects|personal projects)\b",
+        "education": r"\b(education|academic background|qualification)\b",
+        "certifications": r"\b(certifications|certificates|licenses)\b"
+    }
+    sections = {key: "" for key in patterns}
+    matches = []
+    for section, pattern in patterns.items():
+        for match in re.finditer(pattern, text):
+            matches.append((match.start(), section))
+    matches.sort()
+    for i, (start, section) in enumerate(matches):
+        end = matches[i + 1][0] if i + 1 < len(matches) else len(text)
+        content = text[start:end]
+        parts = content.split('\n', 1)
+        body = parts[1].strip() if len(parts) > 1 else ""
+        sections[section] = sections[section] + "\n" + body if sections[section] else body
+    has_fresher_keyword = bool(re.search(r"\b(fresher|student|recent graduate)\b", text))
+    has_duration = bool(re.search(r"\b\d+\s*(years?|yrs?)\b", text))
+    sections["is_fresher"] = has_fresher_keyword or not has_duration
+    return sections
+
+def synthetic_resume(n_sections, rng):
+    lines = ["Jane Doe", "jane@example.com"]
+    for _ in range(n_sections):
+        lines.append(rng.choice(HEADINGS))
+        for _ in range(rng.randint(3, 12)):
+            words = rng.choices(FILLER, k=rng.randint(6, 16))
+            if rng.random() < 0.3:
+                words.append(f"{rng.randint(1, 9)} years")
+            lines.append(" ".join(words))
+    return "\n".join(lines)
+
+def best_of(fn, resumes, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in resumes:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(resumes) * 1000
+
+def main(n_resumes=200, n_sections=60):
+    rng = random.Random(0)
+    resumes = [synthetic_resume(n_sections, rng) for _ in range(n_resumes)]
+    avg_kb = sum(len(r) for r in resumes) / len(resumes) / 1024
+
+    mismatches = sum(reference_extract_sections(r) != extract_sections(r) for r in resumes)
+    print(f"{n_resumes} resumes, {n_sections} sections each, {avg_kb:.0f} KB average")
+    print(f"Identical output: {n_resumes - mismatches}/{n_resumes}")
+
+    old_ms = best_of(reference_extract_sections, resumes)
+    new_ms = best_of(extract_sections, resumes)
+    spans_ms = best_of(find_sections, resumes)
+    print(f"{'per-pattern scans':24} {old_ms:8.3f} ms/resume")
+    print(f"{'single pass':24} {new_ms:8.3f} ms/resume ({old_ms / new_ms:.1f}x)")
+    print(f"{'single pass, spans only':24} {spans_ms:8.3f} ms/resume ({old_ms / spans_ms:.1f}x)")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:3])))
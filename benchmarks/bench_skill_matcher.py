@@ -0,0 +1,79 @@
+"""
+Benchmark: per-skill regex loop vs. the compiled SkillMatcher automaton.
+
+Grows a synthetic skills dictionary from 100 to 50k entries (seeded with
+MASTER_SKILLS_DB) and times build cost and per-document extraction for both
+approaches on the same resume text.
+
+Usage:
+    python benchmarks/bench_skill_matcher.py [--max-regex N]
+"""
+import os
+import re
+import sys
+import time
+import random
+import string
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.skill_gap import MASTER_SKILLS_DB
+from src.skill_matcher import SkillMatcher
+
+SIZES = [100, 1000, 10000, 50000]
+
+def synthetic_skills(n, rng):
+    skills = list(MASTER_SKILLS_DB)
+    seen = set(skills)
+    while len(skills) < n:
+        words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        skill = " ".join(words)
+        if skill not in seen:
+            seen.add(skill)
+            skills.append(skill)
+    return skills[:n]
+
+def synthetic_resume(skills, rng, n_words=800):
+    filler = ["experience", "built", "team", "years", "project", "using", "and", "with", "the"]
+    words = [rng.choice(skills) if rng.random() < 0.1 else rng.choice(filler) for _ in range(n_words)]
+    return ", ".join(words)
+
+def regex_extract(skills, text):
+    # The original extract_skills loop
+    found = set()
+    for skill in skills:
+        if re.search(r'\b' + re.escape(skill) + r'\b', text):
+            found.add(skill)
+    return found
+
+def main(max_regex=50000):
+    rng = random.Random(42)
+    print(f"{'skills':>8} {'build ms':>9} {'matcher ms':>11} {'regex ms':>10} {'speedup':>8} {'same':>5}")
+    for n in SIZES:
+        skills = synthetic_skills(n, rng)
+        text = synthetic_resume(skills, rng)
+        
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        build = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        found = matcher.extract(text)
+        scan = time.perf_counter() - start
+        
+        if n <= max_regex:
+            start = time.perf_counter()
+            expected = regex_extract(skills, text)
+            loop = time.perf_counter() - start
+            # Symbol-edged skills (c++, c#) are matched more loosely by design
+            same = {s for s in found ^ expected if s not in ("c++", "c#")} == set()
+            print(f"{n:>8} {build * 1000:>9.1f} {scan * 1000:>11.2f} {loop * 1000:>10.1f} {loop / scan:>7.0f}x {str(same):>5}")
+        else:
+            print(f"{n:>8} {build * 1000:>9.1f} {scan * 1000:>11.2f} {'-':>10} {'-':>8} {'-':>5}")
+
+if __name__ == "__main__":
+    max_regex = 50000
+    if "--max-regex" in sys.argv:
+        max_regex = int(sys.argv[sys.argv.index("--max-regex") + 1])
+    main(max_regex)
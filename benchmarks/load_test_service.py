@@ -0,0 +1,100 @@
+"""
+Load test for the HTTP scoring service (src.scoring_service).
+
+Sends POST /score requests from `concurrency` keep-alive connections and
+reports latency percentiles and throughput. Each request carries a
+slightly different resume so the extraction cache doesn't serve them all.
+
+Usage:
+    python -m src.scoring_service --port 8080 &
+    python benchmarks/load_test_service.py --port 8080 --requests 200 --concurrency 16
+"""
+import time
+import json
+import asyncio
+import argparse
+
+SAMPLE_RESUME = """
+Jane Doe
+Technical Skills
+Python, SQL, Machine Learning, Pandas, NumPy, Tableau, Excel, Power BI
+Experience
+Data Analyst at Acme Corp, 3 years. Built dashboards and forecasting models.
+Projects
+Customer churn prediction using scikit-learn and XGBoost.
+Education
+B.Tech Computer Science
+Certifications
+AWS Certified Cloud Practitioner
+"""
+
+async def post(reader, writer, host, path, body):
+    head = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Type: application/octet-stream\r\nContent-Length: {len(body)}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    payload = json.loads(await reader.readexactly(length))
+    return int(status_line.split()[1]), payload
+
+async def client(host, port, path, bodies, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            status, _ = await post(reader, writer, host, path, body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+async def run(host, port, n_requests, concurrency, domain=None):
+    path = "/score?filename=resume.txt" + (f"&domain={domain}" if domain else "")
+    bodies = [(SAMPLE_RESUME + f"\nReference {i}").encode('utf-8') for i in range(n_requests)]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client(host, port, path, bodies[i::concurrency], latencies, errors)
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    print(f"Requests: {n_requests}, concurrency: {concurrency}, errors: {len(errors)}")
+    print(f"p50 latency : {percentile(latencies, 50) * 1000:8.1f} ms")
+    print(f"p99 latency : {percentile(latencies, 99) * 1000:8.1f} ms")
+    print(f"Throughput  : {n_requests / elapsed:8.1f} req/s")
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /health HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    health = (await reader.read()).split(b"\r\n\r\n", 1)[1]
+    writer.close()
+    health = json.loads(health)
+    if health.get("batches"):
+        print(f"Mean batch  : {health['batched_items'] / health['batches']:8.1f} resumes")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the scoring service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--domain", default=None, help="Score a single role (default: all roles)")
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.requests, args.concurrency, args.domain))
+
+if __name__ == "__main__":
+    main()
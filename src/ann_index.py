@@ -0,0 +1,342 @@
+import os
+import json
+import threading
+import numpy as np
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+# Row-aligned arrays; rows are only appended between retrains
+VECTORS_FILE = "vectors.f32"
+IDS_FILE = "ids.i64"
+LISTS_FILE = "lists.i32"
+ALIVE_FILE = "alive.u8"
+CENTROIDS_FILE = "centroids.f32"
+
+# Below this many vectors search is exact and no clustering is trained
+MIN_TRAIN_ROWS = 1024
+# Re-cluster once the index has grown this many times past its last training
+RETRAIN_GROWTH = 4
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 10
+# Training sample per list for k-means
+TRAIN_SAMPLES_PER_LIST = 64
+
+def _normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def default_n_lists(n_rows):
+    """
+    Number of inverted lists for n_rows vectors (about 4 * sqrt(n), the usual
+    IVF rule of thumb), keeping at least ~40 vectors per list.
+    """
+    return int(max(1, min(4 * np.sqrt(n_rows), n_rows // 40)))
+
+def spherical_kmeans(vectors, n_lists, iterations=KMEANS_ITERATIONS, seed=0):
+    """
+    k-means on the unit sphere (cosine similarity). Returns normalized
+    (n_lists, dim) centroids.
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        empty = np.bincount(assign, minlength=n_lists) == 0
+        # Re-seed empty lists with random vectors so every list gets used
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = _normalize_rows(sums)
+    return centroids
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest neighbour index for normalized
+    embeddings (cosine similarity = inner product), in pure NumPy.
+
+    Vectors are clustered with spherical k-means into `n_lists` lists; a
+    query is compared with the centroids and only the vectors in its
+    `nprobe` nearest lists are scanned. Raising nprobe trades latency for
+    recall (nprobe >= n_lists is exact search). Until MIN_TRAIN_ROWS vectors
+    are stored every search is exact.
+
+    add() and delete() are incremental: rows are appended to the files in
+    `index_dir` (vectors are memory-mapped for search) and deletes are
+    tombstones. When the index has grown RETRAIN_GROWTH times past its last
+    training it is re-clustered, which also drops deleted rows and stores
+    every list contiguously. Use one writer process at a time; readers pick
+    up changes through refresh().
+
+    Args:
+        index_dir (str): Directory holding the index files.
+        dim (int): Vector size; taken from the first add() if not given.
+        nprobe (int): Default number of lists scanned per query.
+    """
+    def __init__(self, index_dir, dim=None, nprobe=DEFAULT_NPROBE):
+        self.index_dir = index_dir
+        self.dim = dim
+        self.nprobe = nprobe
+        self.trained_rows = 0
+        self._rows = 0
+        self._centroids = None
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._lists = np.zeros(0, dtype=np.int32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._row_of = {}
+        self._list_rows = []
+        self._vectors = None
+        self._meta_stamp = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    @property
+    def n_lists(self):
+        return 0 if self._centroids is None else len(self._centroids)
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def __contains__(self, item_id):
+        return int(item_id) in self._row_of
+
+    # --- Persistence ----------------------------------------------------------
+
+    def _stat_meta(self):
+        try:
+            stat = os.stat(self._path(META_FILE))
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self):
+        try:
+            with open(self._path(META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported ANN index format in {self.index_dir}")
+        self._meta_stamp = self._stat_meta()
+        self.dim, self._rows, self.trained_rows = meta["dim"], meta["rows"], meta["trained_rows"]
+        n = self._rows
+        self._ids = np.fromfile(self._path(IDS_FILE), dtype=np.int64, count=n)
+        self._lists = np.fromfile(self._path(LISTS_FILE), dtype=np.int32, count=n)
+        self._alive = np.fromfile(self._path(ALIVE_FILE), dtype=np.uint8, count=n).astype(bool)
+        if meta["n_lists"]:
+            self._centroids = np.fromfile(self._path(CENTROIDS_FILE), dtype=np.float32).reshape(-1, self.dim)
+        else:
+            self._centroids = None
+        self._vectors = None
+        self._reindex()
+        return True
+
+    def _save_meta(self):
+        meta = {"format_version": FORMAT_VERSION, "dim": self.dim, "rows": self._rows,
+                "n_lists": self.n_lists, "trained_rows": self.trained_rows}
+        tmp_path = self._path(f"{META_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        # The meta file goes last: readers only look at `rows` rows of each array
+        os.replace(tmp_path, self._path(META_FILE))
+        self._meta_stamp = self._stat_meta()
+
+    def refresh(self):
+        """
+        Reloads the index if another process changed it. Returns True if it did.
+        """
+        with self._lock:
+            if self._stat_meta() == self._meta_stamp:
+                return False
+            return self._load()
+
+    def _reindex(self):
+        self._row_of = {int(i): row for row, i in enumerate(self._ids) if self._alive[row]}
+        if self._centroids is None:
+            self._list_rows = []
+            return
+        order = np.argsort(self._lists, kind="stable")
+        bounds = np.searchsorted(self._lists[order], np.arange(self.n_lists + 1))
+        self._list_rows = [order[bounds[i]:bounds[i + 1]] for i in range(self.n_lists)]
+
+    def _vector_matrix(self):
+        if self._rows == 0:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        if self._vectors is None or self._vectors.shape[0] != self._rows:
+            self._vectors = np.memmap(self._path(VECTORS_FILE), dtype=np.float32, mode='r', shape=(self._rows, self.dim))
+        return self._vectors
+
+    def _append(self, name, values):
+        # Trim anything past `rows` left by an interrupted write first
+        path = self._path(name)
+        with open(path, 'ab') as f:
+            f.truncate(self._rows * values.dtype.itemsize * (values.shape[1] if values.ndim == 2 else 1))
+            np.ascontiguousarray(values).tofile(f)
+
+    # --- Updates --------------------------------------------------------------
+
+    def add(self, ids, vectors):
+        """
+        Adds (or replaces) vectors under integer ids. Vectors are normalized here.
+        """
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        vectors = _normalize_rows(vectors)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors differ in length")
+        if not len(ids):
+            return
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+            os.makedirs(self.index_dir, exist_ok=True)
+            # Within one call the last vector for an id wins
+            replaced = [self._row_of[int(i)] for i in ids if int(i) in self._row_of]
+            if replaced:
+                self._mark_deleted(replaced)
+            last = {int(i): n for n, i in enumerate(ids)}
+            alive = np.zeros(len(ids), dtype=bool)
+            alive[list(last.values())] = True
+            lists = (np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+                     if self._centroids is not None else np.zeros(len(ids), dtype=np.int32))
+
+            self._append(VECTORS_FILE, vectors)
+            self._append(IDS_FILE, ids)
+            self._append(LISTS_FILE, lists)
+            self._append(ALIVE_FILE, alive.astype(np.uint8))
+            first = self._rows
+            self._rows += len(ids)
+            self._ids = np.concatenate([self._ids, ids])
+            self._lists = np.concatenate([self._lists, lists])
+            self._alive = np.concatenate([self._alive, alive])
+            for item_id, n in last.items():
+                self._row_of[item_id] = first + n
+            if self._centroids is not None:
+                for lst in np.unique(lists):
+                    new_rows = first + np.flatnonzero(lists == lst)
+                    self._list_rows[lst] = np.concatenate([self._list_rows[lst], new_rows])
+            self._save_meta()
+
+            if len(self._row_of) >= max(MIN_TRAIN_ROWS, RETRAIN_GROWTH * self.trained_rows):
+                self._train()
+
+    def _mark_deleted(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        self._alive[rows] = False
+        alive = np.memmap(self._path(ALIVE_FILE), dtype=np.uint8, mode='r+', shape=(self._rows,))
+        alive[rows] = 0
+        alive.flush()
+        del alive
+        for row in rows:
+            self._row_of.pop(int(self._ids[row]), None)
+
+    def delete(self, ids):
+        """
+        Removes ids from the index. Returns how many were present.
+        """
+        with self._lock:
+            rows = [self._row_of[int(i)] for i in ids if int(i) in self._row_of]
+            if rows:
+                self._mark_deleted(rows)
+                self._save_meta()
+            return len(rows)
+
+    def train(self, n_lists=None):
+        """
+        (Re-)clusters every stored vector into n_lists lists (default:
+        default_n_lists) and rewrites the files without deleted rows, each
+        list stored contiguously.
+        """
+        with self._lock:
+            self._train(n_lists)
+
+    def _train(self, n_lists=None):
+        rows = np.flatnonzero(self._alive)
+        if not len(rows):
+            return
+        n_lists = min(n_lists or default_n_lists(len(rows)), len(rows))
+        vectors = np.asarray(self._vector_matrix()[rows])
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(len(rows), min(len(rows), n_lists * TRAIN_SAMPLES_PER_LIST), replace=False)]
+        centroids = spherical_kmeans(sample, n_lists)
+        lists = np.concatenate([np.argmax(chunk @ centroids.T, axis=1)
+                                for chunk in np.array_split(vectors, max(1, len(vectors) // 8192))]).astype(np.int32)
+        order = np.argsort(lists, kind="stable")
+        ids, lists, vectors = self._ids[rows][order], lists[order], vectors[order]
+
+        # Write the new arrays next to the old ones and swap them in
+        self._vectors = None
+        suffix = f".{os.getpid()}.tmp"
+        for name, values in ((VECTORS_FILE, vectors), (IDS_FILE, ids), (LISTS_FILE, lists),
+                             (ALIVE_FILE, np.ones(len(ids), dtype=np.uint8)), (CENTROIDS_FILE, centroids)):
+            np.ascontiguousarray(values).tofile(self._path(name) + suffix)
+        for name in (VECTORS_FILE, IDS_FILE, LISTS_FILE, ALIVE_FILE, CENTROIDS_FILE):
+            os.replace(self._path(name) + suffix, self._path(name))
+        self._centroids = centroids
+        self._rows = self.trained_rows = len(ids)
+        self._ids, self._lists = ids, lists
+        self._alive = np.ones(len(ids), dtype=bool)
+        self._reindex()
+        self._save_meta()
+
+    # --- Search ---------------------------------------------------------------
+
+    def get(self, ids):
+        """
+        Stored (normalized) vectors for ids, one row each; missing ids give zeros.
+        """
+        rows = np.array([self._row_of.get(int(i), -1) for i in ids], dtype=np.int64)
+        out = np.zeros((len(rows), self.dim or 0), dtype=np.float32)
+        found = np.flatnonzero(rows >= 0)
+        if len(found):
+            # Gather in file order, then put the vectors back in request order
+            order = found[np.argsort(rows[found])]
+            out[order] = self._vector_matrix()[rows[order]]
+        return out
+
+    def _candidate_rows(self, query, nprobe):
+        if self._centroids is None or nprobe >= self.n_lists:
+            return np.flatnonzero(self._alive)
+        probe = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        rows = np.concatenate([self._list_rows[lst] for lst in probe])
+        return rows[self._alive[rows]]
+
+    def search(self, query, k=10, nprobe=None, exact=False):
+        """
+        Approximate top-k by cosine similarity.
+
+        Args:
+            query: 1D query vector (normalized here).
+            k (int): Number of neighbours.
+            nprobe (int): Lists scanned (default: self.nprobe).
+            exact (bool): Scan every vector instead.
+
+        Returns:
+            tuple: (ids, similarities) arrays, best first.
+        """
+        query = _normalize_rows(query)[0]
+        rows = np.flatnonzero(self._alive) if exact else self._candidate_rows(query, nprobe or self.nprobe)
+        if not len(rows):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        # Sorted rows read the memory-mapped file front to back
+        rows = np.sort(rows)
+        sims = self._vector_matrix()[rows] @ query
+        if len(rows) > k:
+            top = np.argpartition(-sims, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-sims[top], kind="stable")]
+        return self._ids[rows[top]], sims[top]
+
+    def similarities(self, query, ids):
+        """
+        Exact cosine similarity of the query to each of ids (0 for missing ids).
+        """
+        return self.get(ids) @ _normalize_rows(query)[0]
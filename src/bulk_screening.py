@@ -0,0 +1,276 @@
+"""
+Headless bulk screening: scores a directory (or glob) of resumes against a
+set of roles with a process pool and streams the results to JSONL or CSV.
+
+Usage:
+    python -m src.bulk_screening resumes/ --output results.jsonl
+    python -m src.bulk_screening "inbox/**/*.pdf" --domains Data_Scientist Data_Analyst \
+        --output results.csv --workers 8
+
+Re-running the same command resumes from the checkpoint file, skipping
+resumes that were already scored.
+"""
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from src.data_loader import load_jds, JD_DIR
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+def collect_files(inputs):
+    """
+    Expands directories (recursively) and glob patterns into resume paths.
+    """
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = glob.glob(os.path.join(item, '**', '*'), recursive=True)
+        else:
+            candidates = glob.glob(item, recursive=True)
+        files.extend(p for p in candidates if os.path.isfile(p) and p.lower().endswith(SUPPORTED_EXTENSIONS))
+    return sorted(set(os.path.normpath(p) for p in files))
+
+# --- Worker side -------------------------------------------------------------
+
+_worker_jds = None
+
+def _init_worker(jds):
+    """
+    Runs once per worker process: loads the domain models, spaCy and the
+    encoder up front so individual tasks only do scoring.
+    """
+    global _worker_jds
+    _worker_jds = jds
+    # The pool already uses every core: one BLAS/OpenMP/torch thread per
+    # worker, set before numpy, torch or sklearn are first imported here
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "RESUME_ENCODER_THREADS"):
+        os.environ[var] = "1"
+    import torch
+    torch.set_num_threads(1)
+    import src.data_loader
+    # ... and don't fan each PDF out again
+    src.data_loader.PDF_WORKERS = 1
+    from src.scoring import warmup
+    warmup(jds.keys())
+
+def _score_file(path):
+    from src.data_loader import load_resume
+    from src.scoring import score_all_domains
+    try:
+        resume_text = load_resume(path)
+        if not resume_text:
+            return {"file": path, "error": "Text extraction failed"}
+        # Same per-domain tuples as calculate_composite_score, from one parse of the resume
+        results = score_all_domains(resume_text, _worker_jds)
+    except Exception as e:
+        return {"file": path, "error": f"{type(e).__name__}: {e}"}
+
+    scores = {d: float(r[0]) for d, r in results.items()}
+    best = max(scores, key=scores.get) if scores else None
+    return {
+        "file": path,
+        "best_domain": best,
+        "best_score": scores.get(best),
+        "is_fresher": any(r[4] for r in results.values()),
+        "scores": scores,
+        "match_levels": {d: r[1] for d, r in results.items()},
+        "missing_skills": {d: r[2] for d, r in results.items()}
+    }
+
+# --- Output ------------------------------------------------------------------
+
+class ResultWriter:
+    """
+    Appends results to JSONL or CSV, flushing after every row so an
+    interrupted run loses nothing that was checkpointed.
+
+    When appending to an existing output, a row cut off by a crash is dropped
+    and `files` holds the resumes already written, so a resumed run does not
+    write them twice even if the checkpoint missed them.
+    """
+    def __init__(self, path, domains, fmt=None):
+        self.fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+        self.domains = list(domains)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.files = set() if new_file else self._read_files(path)
+        self._file = open(path, 'a', encoding='utf-8', newline='')
+        if self.fmt == 'csv':
+            self._csv = csv.writer(self._file)
+            if new_file:
+                self._csv.writerow(["file", "best_domain", "best_score", "is_fresher"] + self.domains + ["error"])
+
+    def _read_files(self, path):
+        with open(path, 'rb+') as f:
+            data = f.read()
+            if not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+        lines = data.decode('utf-8', errors='replace').splitlines()
+        if not data.endswith(b"\n"):
+            lines = lines[:-1]
+        if self.fmt == 'csv':
+            return {row[0] for row in csv.reader(lines[1:]) if row}
+        files = set()
+        for line in lines:
+            try:
+                files.add(json.loads(line)["file"])
+            except (ValueError, KeyError, TypeError):
+                continue
+        return files
+
+    def write(self, record):
+        if self.fmt == 'csv':
+            scores = record.get("scores", {})
+            self._csv.writerow(
+                [record["file"], record.get("best_domain", ""), record.get("best_score", ""), record.get("is_fresher", "")]
+                + [scores.get(d, "") for d in self.domains]
+                + [record.get("error", "")]
+            )
+        else:
+            self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class Checkpoint:
+    """
+    Append-only list of files already written to the output.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.done = {line.rstrip('\n') for line in f if line.strip()}
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def mark(self, file_path):
+        self._file.write(file_path + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+# --- Driver ------------------------------------------------------------------
+
+def screen(files, jds, output, workers=None, max_in_flight=None, checkpoint_path=None, fmt=None, progress_every=100):
+    """
+    Scores `files` against `jds` with a process pool, writing each result as it
+    completes. At most `max_in_flight` resumes are queued at once, so memory
+    stays flat for arbitrarily large inputs.
+
+    Returns:
+        dict: Throughput summary.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    checkpoint = Checkpoint(checkpoint_path or output + ".checkpoint")
+    writer = ResultWriter(output, jds.keys(), fmt)
+    # The output is the source of truth: a crash between writing a row and
+    # checkpointing it must not score (and write) that resume again
+    already_done = checkpoint.done | writer.files
+    pending_files = [f for f in files if f not in already_done]
+    skipped = len(files) - len(pending_files)
+    if skipped:
+        print(f"Resuming: {skipped} resumes already scored, {len(pending_files)} to go.")
+
+    done = errors = 0
+    start = time.perf_counter()
+    pool = None
+    try:
+        queue = iter(pending_files)
+        in_flight = {} # future -> (path, pool it ran on, ran alone)
+        # Resumes that were in flight when a worker died. Any of them may be
+        # the culprit, so each is retried alone on a fresh pool before the
+        # queue continues; only a resume that breaks a pool by itself gets an error row.
+        suspects = []
+        while True:
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(jds,))
+            if suspects:
+                if not in_flight:
+                    path = suspects.pop(0)
+                    in_flight[pool.submit(_score_file, path)] = (path, pool, True)
+            else:
+                for path in queue:
+                    in_flight[pool.submit(_score_file, path)] = (path, pool, False)
+                    if len(in_flight) >= max_in_flight:
+                        break
+            if not in_flight:
+                break
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                path, future_pool, alone = in_flight.pop(future)
+                try:
+                    record = future.result()
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. on a malformed file); every task of that pool fails this way
+                    if future_pool is pool:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = None
+                    if not alone:
+                        suspects.append(path)
+                        continue
+                    record = {"file": path, "error": f"{type(e).__name__}: {e}"}
+                except Exception as e:
+                    record = {"file": path, "error": f"{type(e).__name__}: {e}"}
+                writer.write(record)
+                checkpoint.mark(record["file"])
+                done += 1
+                errors += "error" in record
+                if progress_every and done % progress_every == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"  {done}/{len(pending_files)} scored ({done / elapsed:.1f} resumes/sec)")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        writer.close()
+        checkpoint.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "scored": done,
+        "errors": errors,
+        "skipped": skipped,
+        "seconds": round(elapsed, 2),
+        "resumes_per_sec": round(done / elapsed, 2) if elapsed > 0 else 0.0
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score a batch of resumes against job roles.")
+    parser.add_argument("inputs", nargs="+", help="Resume files, directories or glob patterns")
+    parser.add_argument("--output", "-o", required=True, help="Results file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Override the format implied by --output")
+    parser.add_argument("--domains", nargs="+", help="Roles to score against (default: all job descriptions)")
+    parser.add_argument("--jd-dir", default=JD_DIR, help="Directory of job description .txt files")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Max resumes queued at once (default: 2 x workers)")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <output>.checkpoint)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    jds = load_jds(args.jd_dir, args.domains)
+    if not jds:
+        print("No Job Descriptions found!")
+        return 1
+    files = collect_files(args.inputs)
+    if not files:
+        print("No PDF/DOCX/TXT resumes found.")
+        return 1
+
+    print(f"Screening {len(files)} resumes against {len(jds)} roles...")
+    summary = screen(files, jds, args.output, args.workers, args.max_in_flight, args.checkpoint, args.format)
+    print(f"Done: {summary['scored']} scored ({summary['errors']} errors, {summary['skipped']} skipped) "
+          f"in {summary['seconds']}s -> {summary['resumes_per_sec']} resumes/sec")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
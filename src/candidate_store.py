@@ -0,0 +1,413 @@
+"""
+Persistent candidate store: ranks past applicants against a new job description.
+
+Usage:
+    python -m src.candidate_store add resumes/ --store data/candidates
+    python -m src.candidate_store search --jd new_role.txt --top-k 20 [--domain Data_Scientist]
+
+Each stored resume keeps its extracted text, extract_sections output,
+fresher flag and extract_skills set in SQLite (skills also feed an inverted
+skill -> candidate index), and its SBERT embedding in an IVF approximate
+nearest neighbour index (src.ann_index) whose vectors are memory-mapped.
+
+A search narrows the pool cheaply before anything expensive runs: the
+inverted index counts how many of the JD's skills each candidate has, the
+embedding similarity of the survivors comes from one matrix-vector product
+(or, for pools larger than EXACT_LIMIT, from the IVF index scanning only
+`nprobe` lists), and only the best `shortlist` of those are reranked with
+the full composite score (one score_batch over the shortlist). The JD is
+encoded once per search.
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+import numpy as np
+
+from src.jd_index import text_hash
+from src.ann_index import IVFIndex, DEFAULT_NPROBE
+
+STORE_DIR = "data/candidates"
+DB_FILE = "candidates.db"
+VECTORS_DIR = "vectors"
+# Resumes encoded per encoder call while adding
+ADD_BATCH_SIZE = 64
+DEFAULT_SHORTLIST = 50
+# Weight of skill overlap vs. embedding similarity in the prefilter ranking
+SKILL_WEIGHT = 0.5
+# Up to this many candidates are compared with the JD exactly; beyond it the
+# IVF index returns the ANN_CANDIDATES nearest ones
+EXACT_LIMIT = 20000
+ANN_CANDIDATES = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    source TEXT UNIQUE NOT NULL,
+    sha256 TEXT NOT NULL,
+    text TEXT NOT NULL,
+    sections TEXT NOT NULL,
+    is_fresher INTEGER NOT NULL,
+    added REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS candidate_skills (
+    skill TEXT NOT NULL,
+    candidate_id INTEGER NOT NULL,
+    PRIMARY KEY (skill, candidate_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS candidate_skills_by_candidate ON candidate_skills (candidate_id);
+"""
+
+class CandidateStore:
+    """
+    SQLite database plus an IVF embedding index (keyed by candidate id) in
+    `store_dir`. Use one writer process at a time; any number of processes
+    may search.
+
+    Args:
+        store_dir (str): Store directory.
+        nprobe (int): Default IVF lists scanned per approximate search.
+    """
+    def __init__(self, store_dir=STORE_DIR, nprobe=DEFAULT_NPROBE):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(store_dir, DB_FILE), check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.vectors = IVFIndex(os.path.join(store_dir, VECTORS_DIR), nprobe=nprobe)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _check_encoder(self):
+        """
+        Records the encoder on first use; afterwards refuses to mix embedding spaces.
+        """
+        from src.encoder import get_encoder
+        encoder_id = get_encoder().model_id
+        stored = self._meta("encoder")
+        if stored is None:
+            self._set_meta("encoder", encoder_id)
+        elif stored != encoder_id:
+            raise ValueError(f"Store was embedded with {stored}, current encoder is {encoder_id}; "
+                             f"rebuild the store with the same encoder settings")
+
+    def add_resumes(self, items):
+        """
+        Adds or updates resumes.
+
+        Args:
+            items: Iterable of (source, text) pairs; source is any unique key,
+                e.g. the file path. A source already stored with the same text
+                is skipped.
+
+        Returns:
+            int: Number of resumes added or updated.
+        """
+        from src.parsed_resume import ParsedResume
+        from src.encoder import get_encoder
+
+        with self._lock:
+            self._check_encoder()
+            changed = 0
+            batch = []
+            for source, text in items:
+                if not text:
+                    continue
+                digest = text_hash(text)
+                row = self.db.execute("SELECT sha256 FROM candidates WHERE source = ?", (source,)).fetchone()
+                if row is not None and row[0] == digest:
+                    continue
+                batch.append((source, digest, ParsedResume(text)))
+                if len(batch) >= ADD_BATCH_SIZE:
+                    changed += self._write_batch(batch, get_encoder())
+                    batch = []
+            if batch:
+                changed += self._write_batch(batch, get_encoder())
+            return changed
+
+    def _write_batch(self, batch, encoder):
+        vectors = encoder.encode_many([resume.text for _, _, resume in batch])
+        now = time.time()
+        ids, replaced = [], []
+        kept, old_vectors = [], None
+        try:
+            with self.db:
+                self._insert_batch(batch, now, ids, replaced)
+                # Inside the transaction: if the index write fails the rows are rolled back
+                # (ids of replaced candidates may be reused, so drop them before adding)
+                kept = [cid for cid in replaced if cid in self.vectors]
+                old_vectors = self.vectors.get(kept)
+                self.vectors.delete(replaced)
+                self.vectors.add(ids, vectors)
+        except BaseException:
+            # The index is not part of the transaction: if the rows were rolled
+            # back after it changed, restore the replaced candidates' vectors
+            if old_vectors is not None:
+                self.vectors.delete(ids)
+                self.vectors.add(kept, old_vectors)
+            raise
+        return len(batch)
+
+    def _insert_batch(self, batch, now, ids, replaced):
+        for source, digest, resume in batch:
+            old = self.db.execute("SELECT id FROM candidates WHERE source = ?", (source,)).fetchone()
+            if old is not None:
+                replaced.append(old[0])
+                self.db.execute("DELETE FROM candidate_skills WHERE candidate_id = ?", (old[0],))
+                self.db.execute("DELETE FROM candidates WHERE id = ?", (old[0],))
+            cursor = self.db.execute(
+                "INSERT INTO candidates (source, sha256, text, sections, is_fresher, added) VALUES (?, ?, ?, ?, ?, ?)",
+                (source, digest, resume.text, json.dumps(resume.sections), int(resume.is_fresher), now))
+            self.db.executemany("INSERT INTO candidate_skills (skill, candidate_id) VALUES (?, ?)",
+                                [(skill, cursor.lastrowid) for skill in resume.skills])
+            ids.append(cursor.lastrowid)
+
+    def add_files(self, paths, progress_every=500):
+        """
+        Extracts and adds resume files (PDF/DOCX/TXT). Returns the number added or updated.
+        """
+        from src.data_loader import load_resume
+        def items():
+            for i, path in enumerate(paths, 1):
+                yield os.path.normpath(path), load_resume(path)
+                if progress_every and i % progress_every == 0:
+                    print(f"  {i}/{len(paths)} extracted")
+        return self.add_resumes(items())
+
+    def remove(self, source):
+        """
+        Removes a candidate. Returns False if it wasn't stored.
+        """
+        with self._lock:
+            old_vector = None
+            try:
+                with self.db:
+                    row = self.db.execute("SELECT id FROM candidates WHERE source = ?", (source,)).fetchone()
+                    if row is None:
+                        return False
+                    self.db.execute("DELETE FROM candidate_skills WHERE candidate_id = ?", (row[0],))
+                    self.db.execute("DELETE FROM candidates WHERE id = ?", (row[0],))
+                    if row[0] in self.vectors:
+                        old_vector = self.vectors.get([row[0]])
+                        self.vectors.delete([row[0]])
+            except BaseException:
+                # Rolled back: the candidate is still stored, so is its vector
+                if old_vector is not None:
+                    self.vectors.add([row[0]], old_vector)
+                raise
+            return True
+
+    def skill_overlap(self, skills):
+        """
+        Inverted-index lookup: {candidate_id: number of `skills` they have},
+        for candidates with at least one.
+        """
+        skills = list(skills)
+        if not skills:
+            return {}
+        placeholders = ",".join("?" * len(skills))
+        return dict(self.db.execute(
+            f"SELECT candidate_id, COUNT(*) FROM candidate_skills WHERE skill IN ({placeholders}) "
+            f"GROUP BY candidate_id", skills))
+
+    def prefilter(self, jd_text, shortlist=DEFAULT_SHORTLIST, min_skill_overlap=1, nprobe=None, query=None):
+        """
+        Cheap first stage of a search: skill overlap from the inverted index
+        and embedding similarity to the JD.
+
+        Candidates sharing fewer than `min_skill_overlap` of the JD's skills
+        are dropped (the filter is skipped when the JD names no known
+        skills). Similarity is computed exactly for up to EXACT_LIMIT
+        remaining candidates; for more, only the ANN_CANDIDATES nearest ones
+        found by the IVF index (scanning `nprobe` lists) are kept. The rest
+        are ranked by SKILL_WEIGHT * overlap fraction + (1 - SKILL_WEIGHT) * similarity.
+        `query` is jd_text's embedding, if the caller already has it.
+
+        Returns:
+            list: Up to `shortlist` (candidate_id, prefilter_score, overlap, similarity)
+                  tuples, best first.
+        """
+        from src.skill_gap import extract_skills
+        from src.encoder import get_encoder
+
+        self._check_encoder()
+        self.vectors.refresh()
+        jd_skills = extract_skills(jd_text)
+        filtered = bool(jd_skills) and min_skill_overlap > 0
+        if filtered:
+            overlap = self.skill_overlap(jd_skills)
+            ids = [cid for cid, n in overlap.items() if n >= min_skill_overlap]
+            n_candidates = len(ids)
+        else:
+            overlap = {}
+            ids = None
+            n_candidates = len(self.vectors)
+        if not n_candidates:
+            return []
+
+        if query is None:
+            query = get_encoder().encode_many([jd_text])[0]
+        if n_candidates <= EXACT_LIMIT:
+            if ids is None:
+                ids, similarities = self.vectors.search(query, n_candidates, exact=True)
+            else:
+                similarities = self.vectors.similarities(query, ids)
+        else:
+            nearest, sims = self.vectors.search(query, ANN_CANDIDATES, nprobe)
+            keep = [n for n, cid in enumerate(nearest) if not filtered or cid in overlap and overlap[cid] >= min_skill_overlap]
+            ids, similarities = nearest[keep], sims[keep]
+        ids = [int(cid) for cid in ids]
+        if not ids:
+            return []
+
+        n_skills = max(len(jd_skills), 1)
+        overlaps = np.array([overlap.get(cid, 0) for cid in ids], dtype=np.float32)
+        scores = SKILL_WEIGHT * overlaps / n_skills + (1 - SKILL_WEIGHT) * np.asarray(similarities)
+        top = np.argsort(-scores, kind="stable")[:shortlist]
+        return [(ids[i], float(scores[i]), int(overlaps[i]), float(similarities[i])) for i in top]
+
+    def _load_candidates(self, ids):
+        placeholders = ",".join("?" * len(ids))
+        return {cid: (source, text, json.loads(sections)) for cid, source, text, sections in self.db.execute(
+            f"SELECT id, source, text, sections FROM candidates WHERE id IN ({placeholders})", ids)}
+
+    def search(self, jd_text, top_k=10, domain=None, shortlist=DEFAULT_SHORTLIST, min_skill_overlap=1, nprobe=None):
+        """
+        Ranks stored candidates against a job description.
+
+        Args:
+            jd_text (str): The new requisition's JD.
+            top_k (int): Number of candidates to return.
+            domain (str): Trained role whose classifier scores the shortlist.
+                Defaults to the role whose JD is closest to jd_text.
+            shortlist (int): How many prefiltered candidates are reranked
+                with the full composite score (at least top_k).
+            min_skill_overlap (int): See prefilter.
+            nprobe (int): IVF lists scanned for large pools (default: the
+                store's nprobe). Higher is slower with better recall.
+
+        Returns:
+            list: Dicts with candidate_id, source, score, match_level,
+                  missing_skills, is_fresher, skill_overlap and similarity,
+                  best first.
+        """
+        from src.parsed_resume import ParsedResume
+        from src.scoring import score_batch, EMBEDDING_MODE
+        from src.encoder import get_encoder
+
+        self._check_encoder()
+        # Shared by domain selection, the prefilter and the rerank
+        query = get_encoder().encode_many([jd_text])[0]
+        domain = domain or nearest_domain(jd_text, query)
+        if domain is None:
+            print("No trained roles to score with!")
+            return []
+        candidates = self.prefilter(jd_text, max(shortlist, top_k), min_skill_overlap, nprobe, query)
+        if not candidates:
+            return []
+        ids = [cid for cid, _, _, _ in candidates]
+        stored = self._load_candidates(ids)
+        embeddings = self.vectors.get(ids)
+
+        resumes = []
+        for cid, embedding in zip(ids, embeddings):
+            _, text, sections = stored[cid]
+            resume = ParsedResume(text, sections)
+            if EMBEDDING_MODE == "full" and cid in self.vectors:
+                # Same direction the encoder would produce; skip re-encoding it
+                resume.embeddings["full"] = embedding
+            resumes.append(resume)
+        scored = score_batch(resumes, {domain: jd_text}, jd_embeddings={domain: query})
+
+        results = []
+        for (cid, _, overlap, similarity), scores in zip(candidates, scored):
+            score, match_level, missing_skills, _, is_fresher = scores[domain]
+            results.append({
+                "candidate_id": cid,
+                "source": stored[cid][0],
+                "score": float(score),
+                "match_level": match_level,
+                "missing_skills": missing_skills,
+                "is_fresher": bool(is_fresher),
+                "skill_overlap": overlap,
+                "similarity": round(similarity, 4)
+            })
+        results.sort(key=lambda r: r["score"], reverse=True)
+        return results[:top_k]
+
+def nearest_domain(jd_text, embedding=None):
+    """
+    The trained role whose indexed JD embedding is closest to jd_text (or to
+    its precomputed `embedding`), or None.
+    """
+    from src.model_registry import available_domains
+    from src.scoring import jd_index, fe
+    jd_index.refresh()
+    trained = set(available_domains())
+    snapshot = jd_index.snapshot()
+    rows = [(i, d) for i, d in enumerate(snapshot[0]) if d in trained]
+    if not rows:
+        return None
+    if embedding is None:
+        embedding = fe.get_sbert_embedding(jd_text)
+    sims = jd_index.similarities(embedding, [i for i, _ in rows], snapshot)
+    return rows[int(np.argmax(sims))][1]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Store past applicants and search them against a new JD.")
+    parser.add_argument("--store", default=STORE_DIR, help="Store directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Add resume files, directories or glob patterns")
+    add.add_argument("inputs", nargs="+")
+    search = commands.add_parser("search", help="Rank stored candidates against a JD")
+    search.add_argument("--jd", required=True, help="Job description .txt file")
+    search.add_argument("--top-k", type=int, default=10)
+    search.add_argument("--domain", default=None, help="Trained role used for reranking (default: closest role)")
+    search.add_argument("--shortlist", type=int, default=DEFAULT_SHORTLIST, help="Candidates reranked with the full score")
+    search.add_argument("--min-skill-overlap", type=int, default=1)
+    search.add_argument("--nprobe", type=int, default=None, help="IVF lists scanned for large pools (recall vs. latency)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = CandidateStore(args.store)
+    try:
+        if args.command == "add":
+            from src.bulk_screening import collect_files
+            files = collect_files(args.inputs)
+            if not files:
+                print("No PDF/DOCX/TXT resumes found.")
+                return 1
+            start = time.perf_counter()
+            changed = store.add_files(files)
+            print(f"Added {changed} of {len(files)} resumes in {time.perf_counter() - start:.1f}s "
+                  f"({len(store)} candidates stored)")
+        else:
+            with open(args.jd, 'r', encoding='utf-8') as f:
+                jd_text = f.read()
+            start = time.perf_counter()
+            results = store.search(jd_text, args.top_k, args.domain, args.shortlist, args.min_skill_overlap, args.nprobe)
+            for rank, r in enumerate(results, 1):
+                print(f"{rank:3}. {r['score']:6.2f}  {r['match_level']:15} {r['source']}")
+            print(f"{len(results)} results from {len(store)} candidates in {time.perf_counter() - start:.2f}s")
+    finally:
+        store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import os
+import re
+import json
+import uuid
+import numpy as np
+
+from src.preprocessing import preprocess_text
+
+COMPACT_DIR = "models/compact"
+FORMAT_VERSION = 1
+
+# Flattened model arrays, one .npy file each. Tree nodes from every forest
+# of every calibrated classifier are concatenated; child indices are global.
+# Each export writes its arrays under new file names (listed in meta.json),
+# so a model already memory-mapped by a running process is never modified.
+ARRAYS = ("idf", "roots", "feature", "threshold", "left", "right", "leaf_proba", "calib_a", "calib_b")
+
+def write_compact(pipeline, out_dir):
+    """
+    Writes a fitted TF-IDF -> CalibratedClassifierCV(RandomForest, sigmoid)
+    pipeline as plain arrays plus a small JSON header.
+
+    Safe to run while the model is being served: the arrays go to files
+    named for this export, meta.json is swapped to point at them in one
+    os.replace, and only files referenced by neither the new nor the
+    previous meta.json are removed afterwards (open mappings keep their
+    data even then).
+    """
+    vectorizer, calibrated = pipeline[0], pipeline[-1]
+    if calibrated.method != "sigmoid":
+        raise ValueError(f"Only sigmoid calibration can be exported, not {calibrated.method}")
+    if vectorizer.preprocessor is not preprocess_text:
+        raise ValueError("Only pipelines using src.preprocessing.preprocess_text can be exported")
+    if getattr(vectorizer, "ngram_range", (1, 1)) != (1, 1) or vectorizer.sublinear_tf or not vectorizer.use_idf:
+        raise ValueError("Only unigram TF-IDF vectorizers with idf weighting can be exported")
+
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+
+    roots, feature, threshold, left, right, leaf_proba = [], [], [], [], [], []
+    calib_a, calib_b, trees_per_classifier = [], [], []
+    offset = 0
+    max_depth = 0
+    for classifier in calibrated.calibrated_classifiers_:
+        forest = classifier.estimator
+        trees_per_classifier.append(len(forest.estimators_))
+        calib_a.append(classifier.calibrators[0].a_)
+        calib_b.append(classifier.calibrators[0].b_)
+        for tree in forest.estimators_:
+            t = tree.tree_
+            nodes = np.arange(t.node_count) + offset
+            is_leaf = t.children_left == -1
+            # Leaves point at themselves so a fixed number of steps settles every row
+            left.append(np.where(is_leaf, nodes, t.children_left + offset))
+            right.append(np.where(is_leaf, nodes, t.children_right + offset))
+            feature.append(np.where(is_leaf, 0, t.feature))
+            threshold.append(np.where(is_leaf, np.inf, t.threshold))
+            counts = t.value[:, 0, :]
+            totals = counts.sum(axis=1)
+            totals[totals == 0] = 1
+            leaf_proba.append(counts[:, 1] / totals)
+            roots.append(offset)
+            offset += t.node_count
+            max_depth = max(max_depth, t.max_depth)
+
+    arrays = {
+        "idf": np.asarray(vectorizer.idf_, dtype=np.float64),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "leaf_proba": np.concatenate(leaf_proba).astype(np.float64),
+        "calib_a": np.asarray(calib_a, dtype=np.float64),
+        "calib_b": np.asarray(calib_b, dtype=np.float64)
+    }
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "token_pattern": vectorizer.token_pattern,
+        "norm": vectorizer.norm,
+        "vocabulary": terms,
+        "trees_per_classifier": trees_per_classifier,
+        "max_depth": int(max_depth)
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    meta_path = os.path.join(out_dir, "meta.json")
+    previous = set()
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            previous = set(_array_files(json.load(f)).values())
+    except (OSError, ValueError):
+        pass
+
+    generation = uuid.uuid4().hex[:12]
+    meta["arrays"] = {name: f"{name}.{generation}.npy" for name in arrays}
+    for name, values in arrays.items():
+        np.save(os.path.join(out_dir, meta["arrays"][name]), values)
+    # meta.json goes last: loaders (and the registry's mtime check) key on it
+    tmp_path = os.path.join(out_dir, f"meta.json.{generation}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+    # Keep the previous export for readers that loaded its meta.json just before the swap
+    keep = previous | set(meta["arrays"].values())
+    for entry in os.listdir(out_dir):
+        if entry.endswith(".npy") and entry not in keep:
+            try:
+                os.remove(os.path.join(out_dir, entry))
+            except OSError:
+                pass
+
+def _array_files(meta):
+    # Exports from before versioned file names used <name>.npy
+    return meta.get("arrays") or {name: name + ".npy" for name in ARRAYS}
+
+class CompactModel:
+    """
+    Array-backed replacement for a pickled domain pipeline.
+
+    Opening one reads a small JSON header and memory-maps the .npy arrays,
+    so it costs a few milliseconds and processes scoring the same domain
+    share the pages. predict_proba reproduces the pipeline: TF-IDF with the
+    same preprocessor and token pattern, every forest traversed at once with
+    vectorized NumPy steps, then per-classifier sigmoid calibration averaged
+    the way CalibratedClassifierCV does.
+    """
+    def __init__(self, meta, arrays):
+        self.classes_ = np.array([0, 1])
+        self._token_re = re.compile(meta["token_pattern"])
+        self._norm = meta["norm"]
+        self._terms = meta["vocabulary"]
+        self._vocabulary = None
+        self._trees_per_classifier = meta["trees_per_classifier"]
+        self._max_depth = meta["max_depth"]
+        for name in ARRAYS:
+            setattr(self, "_" + name, arrays[name])
+
+    @classmethod
+    def open(cls, path, mmap_mode='r'):
+        with open(os.path.join(path, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model format in {path}")
+        files = _array_files(meta)
+        arrays = {name: np.load(os.path.join(path, files[name]), mmap_mode=mmap_mode) for name in ARRAYS}
+        return cls(meta, arrays)
+
+    @property
+    def vocabulary(self):
+        if self._vocabulary is None:
+            self._vocabulary = {term: i for i, term in enumerate(self._terms)}
+        return self._vocabulary
+
+    def transform(self, texts):
+        """
+        Dense TF-IDF matrix, as the fitted TfidfVectorizer would produce.
+        """
+        vocabulary = self.vocabulary
+        X = np.zeros((len(texts), len(self._terms)))
+        for row, text in enumerate(texts):
+            for token in self._token_re.findall(preprocess_text(text)):
+                column = vocabulary.get(token)
+                if column is not None:
+                    X[row, column] += 1
+        X *= self._idf
+        if self._norm == "l2":
+            norms = np.sqrt((X * X).sum(axis=1))
+            norms[norms == 0] = 1
+            X /= norms[:, None]
+        return X
+
+    def _forest_probas(self, X):
+        # Forests compare float32 features against float64 thresholds
+        X = X.astype(np.float32)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self._roots, (X.shape[0], len(self._roots)))
+        for _ in range(self._max_depth):
+            go_left = X[rows, self._feature[nodes]] <= self._threshold[nodes]
+            nodes = np.where(go_left, self._left[nodes], self._right[nodes])
+        return self._leaf_proba[nodes] # (n_texts, n_trees)
+
+    def predict_proba(self, texts):
+        X = self.transform(list(texts))
+        tree_probas = self._forest_probas(X)
+        proba = np.zeros(X.shape[0])
+        start = 0
+        for i, n_trees in enumerate(self._trees_per_classifier):
+            forest_proba = tree_probas[:, start:start + n_trees].sum(axis=1) / n_trees
+            start += n_trees
+            proba += 1 / (1 + np.exp(self._calib_a[i] * forest_proba + self._calib_b[i]))
+        proba /= len(self._trees_per_classifier)
+        return np.column_stack([1 - proba, proba])
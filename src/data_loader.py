@@ -1,38 +1,207 @@
+import io
 import os
-import pdfplumber
-import docx
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
 
-def extract_text_from_pdf(file_path):
-    text = ""
+# PDFs with at least this many pages are split across worker processes
+PARALLEL_PAGE_THRESHOLD = 24
+# Pages handed to each worker task
+PAGES_PER_TASK = 8
+# Worker processes for parallel PDF extraction (None = CPU count, 1 = never parallel).
+# Set to 1 inside processes that are themselves pool workers.
+PDF_WORKERS = None
+
+JD_DIR = "data/job_descriptions"
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+def _as_file(source):
+    """
+    Paths and file-like objects pass through; bytes-like data is wrapped in
+    a BytesIO (which shares the buffer of a bytes object instead of copying it).
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+def _describe(source):
+    if _is_path(source):
+        return os.fspath(source)
+    return getattr(source, "name", None) or f"<{type(source).__name__}>"
+
+def iter_pdf_pages(file_path, start=0, stop=None, max_pages=None, time_budget=None, deadline=None):
+    """
+    Yields the text of each page (empty string for pages without text), one
+    page at a time, releasing each page's parsed objects as it goes.
+
+    Args:
+        file_path: PDF path, bytes-like data or a binary file-like object.
+        start, stop (int): Page range (Python slice semantics).
+        max_pages (int): Stop after this many pages.
+        time_budget (float): Stop once this many seconds have been spent.
+        deadline (float): Absolute time.time() to stop at (shared with worker processes).
+    """
+    if time_budget is not None:
+        budget_deadline = time.time() + time_budget
+        deadline = budget_deadline if deadline is None else min(deadline, budget_deadline)
+    import pdfplumber
+    with pdfplumber.open(_as_file(file_path)) as pdf:
+        yield from _iter_open_pages(pdf, start, stop, max_pages, deadline)
+
+def _iter_open_pages(pdf, start=0, stop=None, max_pages=None, deadline=None):
+    # iter_pdf_pages over an already opened pdfplumber document
+    for count, page in enumerate(pdf.pages[start:stop]):
+        if max_pages is not None and count >= max_pages:
+            return
+        if deadline is not None and time.time() >= deadline:
+            return
+        page_text = page.extract_text()
+        page.close()
+        yield page_text or ""
+
+def _join_pages(page_texts):
+    # Same layout as the original loop: every non-empty page followed by a newline
+    return "".join(t + "\n" for t in page_texts if t)
+
+def _extract_page_range(file_path, start, stop, deadline):
+    """
+    Worker task. Returns (page_texts, complete) where complete is False if the
+    deadline cut the range short.
+    """
+    texts = list(iter_pdf_pages(file_path, start, stop, deadline=deadline))
+    return texts, len(texts) == stop - start
+
+def _extract_parallel(file_path, n_pages, workers, deadline):
+    """
+    Extracts pages [0, n_pages) in PAGES_PER_TASK ranges across worker processes.
+
+    The deadline is enforced on both sides: workers stop between pages once it
+    passes, and results still outstanding at the deadline are abandoned (the
+    pool is shut down without waiting, so a worker stuck in one slow page
+    cannot hold the caller past its budget). The returned pages are always a
+    prefix of the document, like the serial path.
+    """
+    ranges = [(s, min(s + PAGES_PER_TASK, n_pages)) for s in range(0, n_pages, PAGES_PER_TASK)]
+    page_texts = []
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
     try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+        futures = [pool.submit(_extract_page_range, file_path, s, e, deadline) for s, e in ranges]
+        for future in futures:
+            timeout = None if deadline is None else max(deadline - time.time(), 0)
+            try:
+                texts, complete = future.result(timeout=timeout)
+            except FutureTimeout:
+                break
+            page_texts.extend(texts)
+            if not complete:
+                break
+    finally:
+        pool.shutdown(wait=deadline is None, cancel_futures=True)
+    return page_texts
+
+def extract_text_from_pdf(file_path, max_pages=None, time_budget=None, workers=None):
+    """
+    Extracts the text of a PDF.
+
+    Large documents (PARALLEL_PAGE_THRESHOLD pages or more) are split into
+    page ranges extracted by worker processes. The result is identical to a
+    serial page-by-page extraction. Smaller documents are extracted from the
+    same open handle used to count their pages.
+
+    Args:
+        file_path: PDF path, bytes-like data or a binary file-like object.
+            Only paths and bytes-like data are extracted in parallel.
+        max_pages (int): Only extract the first max_pages pages.
+        time_budget (float): Seconds after which extraction stops and the pages
+            extracted so far are returned (checked between pages; in parallel
+            mode, pages still being parsed at the deadline are dropped).
+        workers (int): Worker processes (default PDF_WORKERS; 1 disables parallelism).
+    """
+    page_texts = []
+    try:
+        workers = workers or PDF_WORKERS or os.cpu_count() or 1
+        deadline = time.time() + time_budget if time_budget is not None else None
+        if isinstance(file_path, (bytearray, memoryview)):
+            # Worker processes receive a pickled copy; bytes pickle directly
+            file_path = bytes(file_path)
+        if workers > 1 and (_is_path(file_path) or isinstance(file_path, bytes)):
+            import pdfplumber
+            with pdfplumber.open(_as_file(file_path)) as pdf:
+                n_pages = len(pdf.pages)
+                if max_pages is not None:
+                    n_pages = min(n_pages, max_pages)
+                if n_pages < PARALLEL_PAGE_THRESHOLD:
+                    page_texts.extend(_iter_open_pages(pdf, max_pages=max_pages, deadline=deadline))
+                    return _join_pages(page_texts)
+            try:
+                return _join_pages(_extract_parallel(file_path, n_pages, workers, deadline))
+            except Exception as e:
+                # e.g. no subprocesses allowed here; the serial path still works
+                print(f"Parallel PDF extraction failed for {_describe(file_path)}, falling back to serial: {e}")
+        for page_text in iter_pdf_pages(file_path, max_pages=max_pages, deadline=deadline):
+            page_texts.append(page_text)
     except Exception as e:
-        print(f"Error reading PDF {file_path}: {e}")
-    return text
+        print(f"Error reading PDF {_describe(file_path)}: {e}")
+    return _join_pages(page_texts)
 
 def extract_text_from_docx(file_path):
     try:
-        doc = docx.Document(file_path)
+        import docx
+        doc = docx.Document(_as_file(file_path))
         text = [para.text for para in doc.paragraphs]
         return "\n".join(text)
     except Exception as e:
-        print(f"Error reading DOCX {file_path}: {e}")
+        print(f"Error reading DOCX {_describe(file_path)}: {e}")
         return ""
 
 def extract_text_from_txt(file_path):
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        if _is_path(file_path):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        if isinstance(file_path, (bytes, bytearray, memoryview)):
+            return str(file_path, 'utf-8')
+        data = file_path.read()
+        return data if isinstance(data, str) else data.decode('utf-8')
     except Exception as e:
-        print(f"Error reading TXT {file_path}: {e}")
+        print(f"Error reading TXT {_describe(file_path)}: {e}")
         return ""
 
-def load_resume(file_path):
-    ext = os.path.splitext(file_path)[1].lower()
+def load_jds(jd_dir=JD_DIR, domains=None):
+    """
+    Reads the job descriptions.
+
+    Args:
+        jd_dir (str): Directory of <role>.txt files.
+        domains (list): Only load these roles (default: all).
+
+    Returns:
+        dict: {domain: jd_text}, sorted by domain.
+    """
+    jds = {}
+    if not os.path.exists(jd_dir): return {}
+    for filename in sorted(os.listdir(jd_dir)):
+        if filename.endswith('.txt'):
+            domain = filename.replace('.txt', '')
+            if domains and domain not in domains:
+                continue
+            with open(os.path.join(jd_dir, filename), 'r', encoding='utf-8') as f:
+                jds[domain] = f.read()
+    return jds
+
+def load_resume(file_path, filename=None):
+    """
+    Extracts text from a resume.
+    
+    Args:
+        file_path: Path, bytes-like data (bytes, bytearray, memoryview) or a
+            binary file-like object, so uploads can be read straight from memory.
+        filename (str): Name used to pick the format when file_path is not a
+            path (defaults to the object's .name attribute, if any).
+    """
+    name = filename or (os.fspath(file_path) if _is_path(file_path) else getattr(file_path, "name", ""))
+    ext = os.path.splitext(name)[1].lower()
     if ext == '.pdf':
         return extract_text_from_pdf(file_path)
     elif ext == '.docx':
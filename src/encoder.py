@@ -0,0 +1,140 @@
+import os
+import threading
+import numpy as np
+
+# One MiniLM for the whole process; feature_engineering and semantic_similarity
+# both go through get_encoder() instead of loading their own copy.
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_BATCH_SIZE = 32
+
+class Encoder:
+    """
+    Lazily loaded SentenceTransformer wrapper.
+
+    Args:
+        model_name (str): SentenceTransformer model to load.
+        batch_size (int): Default batch size for encode_many.
+        num_threads (int): If set, caps torch's intra-op CPU threads.
+        quantize (bool): Apply int8 dynamic quantization to the Linear layers.
+            Faster on CPU at the cost of a small embedding drift.
+    """
+    def __init__(self, model_name=MODEL_NAME, batch_size=DEFAULT_BATCH_SIZE, num_threads=None, quantize=False):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.quantize = quantize
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model_id(self):
+        """
+        Identifies the embedding space; int8 vectors differ slightly from fp32.
+        """
+        return f"{self.model_name}:{'int8' if self.quantize else 'fp32'}"
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    def _load(self):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+        model = SentenceTransformer(self.model_name, device='cpu')
+        model.eval()
+        if self.quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    @property
+    def max_tokens(self):
+        """
+        Longest input (in wordpiece tokens, incl. [CLS]/[SEP]) the model sees;
+        anything beyond it is silently truncated by encode().
+        """
+        return self.model.max_seq_length
+
+    def split_windows(self, text, window=None, stride=None):
+        """
+        Splits text into consecutive pieces of at most `window` tokens so each
+        one fits the model without truncation.
+
+        Args:
+            text (str): Text to split.
+            window (int): Tokens per piece (default: max_tokens minus special tokens).
+            stride (int): Tokens between piece starts (default: window, i.e. no overlap).
+
+        Returns:
+            list: Substrings of text, in order.
+        """
+        window = window or self.max_tokens - 2
+        stride = stride or window
+        encoded = self.model.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+        offsets = encoded["offset_mapping"]
+        pieces = []
+        for start in range(0, len(offsets), stride):
+            chunk = offsets[start:start + window]
+            pieces.append(text[chunk[0][0]:chunk[-1][1]])
+            if start + window >= len(offsets):
+                break
+        return pieces
+
+    def encode(self, text):
+        """
+        Returns the embedding of a single text as a 1D array.
+        """
+        return self.encode_many([text])[0]
+
+    def encode_many(self, texts, batch_size=None):
+        """
+        Encodes texts in batches of `batch_size` (default: self.batch_size).
+        Returns a float32 array with one row per text.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        embeddings = self.model.encode(texts, batch_size=batch_size or self.batch_size, show_progress_bar=False)
+        return np.asarray(embeddings, dtype=np.float32)
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+def _default_config():
+    # Deployment knobs, e.g. RESUME_ENCODER_INT8=1 RESUME_ENCODER_THREADS=4
+    threads = os.environ.get("RESUME_ENCODER_THREADS")
+    return {
+        "batch_size": int(os.environ.get("RESUME_ENCODER_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+        "num_threads": int(threads) if threads else None,
+        "quantize": os.environ.get("RESUME_ENCODER_INT8", "0") == "1"
+    }
+
+def get_encoder():
+    """
+    Returns the process-wide encoder, creating it on first use.
+    """
+    global _encoder
+    if _encoder is None:
+        with _encoder_lock:
+            if _encoder is None:
+                _encoder = Encoder(**_default_config())
+    return _encoder
+
+def configure_encoder(**kwargs):
+    """
+    Replaces the process-wide encoder with one built from the given Encoder
+    arguments (unspecified ones fall back to the environment defaults).
+    Call before the first encode; an already loaded model is dropped.
+    """
+    global _encoder
+    config = _default_config()
+    config.update(kwargs)
+    with _encoder_lock:
+        _encoder = Encoder(**config)
+    return _encoder
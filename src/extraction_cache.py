@@ -0,0 +1,157 @@
+import os
+import json
+import uuid
+import hashlib
+import threading
+
+from src.section_extraction import PARSER_VERSION
+
+CACHE_DIR = "data/cache/extraction"
+# Total size the cache may grow to before least recently used entries are removed
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Eviction frees space down to this fraction of max_bytes, so a full cache
+# is not rescanned on every put
+EVICT_TO = 0.9
+# Layout of an entry; part of the key together with the section parser's version
+FORMAT_VERSION = 1
+
+def content_hash(data):
+    """
+    SHA-256 of the raw file bytes, used as the cache key.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+def cache_key(data):
+    """
+    content_hash plus the entry format and section parser versions, so
+    entries written by an older parser are never served (they age out).
+    """
+    return f"{content_hash(data)}-f{FORMAT_VERSION}p{PARSER_VERSION}"
+
+class ExtractionCache:
+    """
+    On-disk cache of resume extraction results keyed by the SHA-256 of the
+    uploaded file (and the parser version, see cache_key), so re-analyzing
+    the same file skips PDF/DOCX parsing.
+
+    Each entry is a small JSON file holding the extracted text and the
+    extract_sections output. Writes go to a unique temp file that is renamed
+    into place, so concurrent writers (several app or worker processes)
+    never expose a partial entry. A hit refreshes the entry's mtime, and
+    once the cache exceeds max_bytes the entries with the oldest mtime are
+    removed first (LRU).
+
+    The directory is only walked when needed: the first put measures it, later
+    puts add their own size to that running total, and a full scan (which
+    also picks up what other processes wrote) runs only once the total
+    crosses max_bytes.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Estimated bytes on disk; None until the first put measures it
+        self._total = None
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key):
+        """
+        Returns {"text": ..., "sections": ...} for a key, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Missing, evicted by another process mid-read, or corrupt
+            return None
+        return entry
+
+    def put(self, key, text, sections):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"text": text, "sections": sections}, f)
+                written = f.tell()
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write extraction cache entry {path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if self._total is None:
+                self._total = self.size()
+            else:
+                self._total += written - replaced
+            over = self._total > self.max_bytes
+        if over:
+            self.evict()
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """
+        Once the cache exceeds max_bytes, removes least recently used entries
+        until it fits in EVICT_TO * max_bytes.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_TO
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    # Already removed by a concurrent evictor
+                    pass
+                total -= size
+                if total <= target:
+                    break
+        with self._lock:
+            self._total = total
+
+    def get_or_extract(self, data, extract_fn):
+        """
+        Returns (text, sections, cache_hit) for raw file bytes, calling
+        extract_fn() -> (text, sections) only on a miss. Empty extractions
+        are not cached.
+        """
+        key = cache_key(data)
+        entry = self.get(key)
+        if entry is not None:
+            return entry["text"], entry["sections"], True
+        text, sections = extract_fn()
+        if text:
+            self.put(key, text, sections)
+        return text, sections, False
+
+extraction_cache = ExtractionCache()
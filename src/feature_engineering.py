@@ -1,19 +1,33 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from functools import lru_cache
+from src.encoder import get_encoder
+from src.section_extraction import find_sections, SECTION_NAMES
+
+def _pool(vectors, pooling):
+    if pooling == "mean":
+        return vectors.mean(axis=0)
+    if pooling == "max":
+        return vectors.max(axis=0)
+    raise ValueError(f"Unknown pooling: {pooling}")
 
 class FeatureEngineer:
     def __init__(self):
-        self.tfidf_vectorizer = TfidfVectorizer(stop_words='english')
+        self._tfidf_vectorizer = None
         self.sbert_model = None # Lazy load
         self.fitted = False
 
+    @property
+    def tfidf_vectorizer(self):
+        # Created on first use so importing scoring doesn't import sklearn
+        if self._tfidf_vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._tfidf_vectorizer = TfidfVectorizer(stop_words='english')
+        return self._tfidf_vectorizer
+
     def load_sbert(self):
         if self.sbert_model is None:
-            # Using a lightweight model for speed
-            self.sbert_model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Shared process-wide MiniLM (see src.encoder)
+            self.sbert_model = get_encoder().model
 
     def fit_transform_tfidf(self, resume_texts):
         """
@@ -33,16 +47,86 @@ class FeatureEngineer:
         """
         Returns the SBERT embedding for a given text.
         """
-        self.load_sbert()
-        return self.sbert_model.encode([text])[0]
+        return get_encoder().encode(text)
+
+    def get_sbert_embeddings(self, texts):
+        """
+        Encodes several texts in a single batched SBERT call.
+        Returns a 2D array with one row per text.
+        """
+        return get_encoder().encode_many(texts)
+
+    @lru_cache(maxsize=32)
+    def get_chunked_embedding(self, text, chunking="sections", pooling="mean"):
+        """
+        Embeds a long resume without truncation.
+        
+        The text is split into chunks that fit the model (along the
+        extract_sections boundaries, or plain token windows), all chunks are
+        encoded in one batch and pooled into a single resume vector. With
+        section chunking, text outside the recognized sections (a summary
+        before the first heading, text on a heading's line) is encoded as
+        one more chunk, so no part of the resume is left out.
+        
+        Args:
+            text (str): Resume text.
+            chunking (str): "sections" or "window". "sections" falls back to
+                windows over the full text when no headings are found.
+            pooling (str): "mean" or "max" over the normalized chunk vectors.
+            
+        Returns:
+            tuple: (resume_vec, section_vecs) where section_vecs maps each
+                   non-empty section to its own pooled vector (empty for
+                   "window" chunking).
+        """
+        encoder = get_encoder()
+        if chunking == "sections":
+            spans = find_sections(text)
+            named = [(name, spans[name]) for name in SECTION_NAMES if spans[name].strip()]
+            if not named:
+                named = [(None, text)]
+            elif spans.unsectioned:
+                named.append((None, spans.unsectioned_text()))
+        elif chunking == "window":
+            named = [(None, text)]
+        else:
+            raise ValueError(f"Unknown chunking: {chunking}")
+            
+        labels, chunks = [], []
+        for name, chunk_text in named:
+            for piece in encoder.split_windows(chunk_text):
+                labels.append(name)
+                chunks.append(piece)
+        if not chunks:
+            return encoder.encode(text), {}
+            
+        vectors = encoder.encode_many(chunks)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        
+        section_vecs = {}
+        for name in dict.fromkeys(labels):
+            if name is not None:
+                rows = [i for i, label in enumerate(labels) if label == name]
+                section_vecs[name] = _pool(vectors[rows], pooling)
+        return _pool(vectors, pooling), section_vecs
 
     def calculate_cosine_similarity(self, vec1, vec2):
         """
         Calculates cosine similarity between two vectors.
         vec1, vec2: 1D or 2D arrays.
         """
+        from sklearn.metrics.pairwise import cosine_similarity
         # Ensure 2D for sklearn cosine_similarity
         if len(vec1.shape) == 1: vec1 = vec1.reshape(1, -1)
         if len(vec2.shape) == 1: vec2 = vec2.reshape(1, -1)
         
         return cosine_similarity(vec1, vec2)[0][0]
+
+    def calculate_cosine_similarities(self, vec, matrix):
+        """
+        Cosine similarity of one vector against every row of a matrix,
+        computed as a single matrix product.
+        """
+        from sklearn.metrics.pairwise import cosine_similarity
+        if len(vec.shape) == 1: vec = vec.reshape(1, -1)
+        return cosine_similarity(vec, matrix)[0]
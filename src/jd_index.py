@@ -0,0 +1,234 @@
+import os
+import json
+import uuid
+import hashlib
+import threading
+import numpy as np
+
+from src.data_loader import JD_DIR
+
+INDEX_DIR = "models/jd_index"
+MANIFEST_FILE = "manifest.json"
+# Each save writes embeddings.<id>.f32 and names it in the manifest; indexes
+# from before that used this fixed name
+EMBEDDINGS_FILE = "embeddings.f32"
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class JDEmbeddingIndex:
+    """
+    On-disk index of job-description embeddings.
+
+    The index lives in `index_dir` as a raw float32 matrix of L2-normalized
+    rows (memory-mapped on load) plus a JSON manifest mapping each domain to
+    its row, the SHA-256 of the JD text it was built from and the file's
+    mtime/size. refresh() re-encodes only the JDs whose content changed.
+    Every save writes a new matrix file and then swaps in the manifest that
+    names it, so a manifest is never paired with another save's matrix; an
+    index whose matrix doesn't match its manifest is rebuilt.
+
+    The loaded (domains, entries, matrix) are published as one tuple, so
+    lookups running in other threads during a refresh always see a matching
+    set of entries and rows.
+
+    Args:
+        get_encoder: Callable returning an object with `encode_many(texts)` and
+            `model_id`. A different model_id than the saved one forces a rebuild.
+    """
+    def __init__(self, get_encoder, jd_dir=JD_DIR, index_dir=INDEX_DIR):
+        self.get_encoder = get_encoder
+        self.jd_dir = jd_dir
+        self.index_dir = index_dir
+        # (domains, {domain: manifest entry}, matrix); None until first loaded
+        self._state = None
+        self._encoder_id = None
+        self._lock = threading.Lock()
+
+    @property
+    def domains(self):
+        state = self._state
+        return list(state[0]) if state is not None else []
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.index_dir, MANIFEST_FILE)
+
+    def _load(self):
+        """
+        Maps the saved index into memory. Returns (domains, entries, matrix),
+        or None if there is no usable index.
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("encoder") != self.get_encoder().model_id:
+            return None
+        try:
+            entries = manifest["domains"]
+            n_rows, dim = len(entries), manifest["dim"]
+            if n_rows:
+                path = os.path.join(self.index_dir, manifest.get("embeddings", EMBEDDINGS_FILE))
+                if os.path.getsize(path) != n_rows * dim * 4:
+                    # Torn or mismatched write: treat as stale and rebuild
+                    return None
+                matrix = np.memmap(path, dtype=np.float32, mode='r', shape=(n_rows, dim))
+            else:
+                matrix = np.zeros((0, dim), dtype=np.float32)
+            domains = sorted(entries, key=lambda d: entries[d]["row"])
+            if [entries[d]["row"] for d in domains] != list(range(n_rows)):
+                return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return domains, entries, matrix
+
+    def _save(self, domains, entries, matrix):
+        os.makedirs(self.index_dir, exist_ok=True)
+        previous = None
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f).get("embeddings")
+        except (OSError, ValueError, AttributeError):
+            pass
+        # The matrix gets a name of its own and the manifest naming it is
+        # swapped in last, so no reader pairs one save's manifest with another's rows
+        token = uuid.uuid4().hex[:12]
+        embeddings = f"embeddings.{token}.f32"
+        tmp_manifest = f"{self.manifest_path}.{token}.tmp"
+        np.ascontiguousarray(matrix, dtype=np.float32).tofile(os.path.join(self.index_dir, embeddings))
+        manifest = {"encoder": self._encoder_id, "dim": int(matrix.shape[1]),
+                    "embeddings": embeddings, "domains": entries}
+        with open(tmp_manifest, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_manifest, self.manifest_path)
+
+        # Keep the previous matrix for readers that loaded its manifest just
+        # before the swap; mapped files stay readable after removal anyway
+        keep = {embeddings, previous}
+        for name in os.listdir(self.index_dir):
+            if name.startswith("embeddings.") and name.endswith(".f32") and name not in keep:
+                try:
+                    os.remove(os.path.join(self.index_dir, name))
+                except OSError:
+                    pass
+
+    def _scan(self):
+        """
+        Returns {domain: (path, stat)} for the JD files on disk.
+        """
+        files = {}
+        if not os.path.isdir(self.jd_dir):
+            return files
+        for filename in sorted(os.listdir(self.jd_dir)):
+            if filename.endswith('.txt'):
+                path = os.path.join(self.jd_dir, filename)
+                files[filename.replace('.txt', '')] = (path, os.stat(path))
+        return files
+
+    def refresh(self):
+        """
+        Brings the index in line with the JD directory, re-encoding only the
+        JDs that are new or whose text hash changed.
+
+        Returns:
+            int: Number of JDs that were (re-)encoded.
+        """
+        with self._lock:
+            encoder_id = self.get_encoder().model_id
+            if self._state is None or self._encoder_id != encoder_id:
+                # First use, or the encoder was reconfigured (e.g. int8)
+                self._state = self._load() or ([], {}, None)
+            self._encoder_id = encoder_id
+            old_domains, old_entries, old_matrix = self._state
+            files = self._scan()
+
+            domains = list(files.keys())
+            entries = {}
+            rows = {}
+            to_encode = {}
+            for domain, (path, stat) in files.items():
+                old = old_entries.get(domain)
+                if old and old["mtime_ns"] == stat.st_mtime_ns and old["size"] == stat.st_size:
+                    entries[domain] = dict(old)
+                    rows[domain] = np.array(old_matrix[old["row"]])
+                    continue
+
+                with open(path, 'r', encoding='utf-8') as f:
+                    text = f.read()
+                digest = text_hash(text)
+                entries[domain] = {"sha256": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                if old and old["sha256"] == digest:
+                    # Touched but not edited
+                    rows[domain] = np.array(old_matrix[old["row"]])
+                else:
+                    to_encode[domain] = text
+
+            unchanged = (domains == old_domains and not to_encode
+                         and all(entries[d] == old_entries.get(d) for d in domains))
+            if unchanged:
+                return 0
+
+            if to_encode:
+                encoded = _normalize_rows(self.get_encoder().encode_many(list(to_encode.values())))
+                rows.update(zip(to_encode.keys(), encoded))
+
+            for i, domain in enumerate(domains):
+                entries[domain]["row"] = i
+            if domains:
+                matrix = np.vstack([rows[d] for d in domains]).astype(np.float32)
+            else:
+                matrix = np.zeros((0, old_matrix.shape[1] if old_matrix is not None else 0), dtype=np.float32)
+
+            try:
+                self._save(domains, entries, matrix)
+                state = self._load()
+            except OSError as e:
+                # Read-only deployment: keep serving from memory
+                print(f"Could not persist JD index to {self.index_dir}: {e}")
+                state = None
+            # One assignment publishes the new domains, entries and rows together
+            self._state = state or (domains, entries, matrix)
+            return len(to_encode)
+
+    def lookup(self, domain, jd_text, snapshot=None):
+        """
+        Returns the stored row for a domain if it was built from exactly
+        this JD text, else None. Pass the same snapshot() to similarities().
+        """
+        entry = (snapshot or self.snapshot())[1].get(domain)
+        if entry is None or entry["sha256"] != text_hash(jd_text):
+            return None
+        return entry["row"]
+
+    def snapshot(self):
+        """
+        The current (domains, entries, matrix); rows looked up in one
+        snapshot are only valid against that snapshot's matrix.
+        """
+        return self._state or ([], {}, None)
+
+    def similarities(self, embedding, rows=None, snapshot=None):
+        """
+        Cosine similarity of an embedding against the indexed JDs as a single
+        matrix-vector product.
+
+        Args:
+            embedding: 1D query vector (normalized here).
+            rows (list): Restrict to these rows, in this order. Defaults to all.
+            snapshot: The snapshot() the rows were looked up in (default: the current one).
+
+        Returns:
+            np.ndarray: One similarity per requested row.
+        """
+        query = _normalize_rows(np.asarray(embedding).reshape(1, -1))[0]
+        matrix = (snapshot or self.snapshot())[2]
+        matrix = matrix if rows is None else matrix[rows]
+        return matrix @ query
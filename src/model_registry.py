@@ -0,0 +1,152 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+from src.model_training import load_model, get_model_path, MODEL_FORMAT
+
+# Enough for every shipped role plus headroom; the least recently used
+# model is dropped once this many are resident.
+DEFAULT_CAPACITY = 16
+
+class ModelRegistry:
+    """
+    In-process cache of unpickled domain models.
+
+    Models are kept in LRU order up to `capacity`. Every lookup compares the
+    .pkl file's mtime against the one recorded at load time, so retraining a
+    domain on disk invalidates the cached copy without a restart.
+
+    Unpickling happens outside the registry lock, under a per-domain lock:
+    concurrent requests for one domain load it once, and lookups of domains
+    that are already resident never wait behind a load.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY, loader=load_model, path_fn=get_model_path):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._loader = loader
+        self._path_fn = path_fn
+        self._models = OrderedDict() # domain -> (mtime, model)
+        self._lock = threading.Lock()
+        self._load_locks = {} # domain -> lock held while that domain is unpickled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _mtime(self, domain):
+        try:
+            return os.path.getmtime(self._path_fn(domain))
+        except OSError:
+            return None
+
+    def get(self, domain):
+        """
+        Returns the model for a domain, loading it on first use.
+        Returns None if no model file exists for the domain.
+        """
+        mtime = self._mtime(domain)
+        with self._lock:
+            entry = self._models.get(domain)
+            if entry is not None:
+                if entry[0] == mtime:
+                    self._models.move_to_end(domain)
+                    self.hits += 1
+                    return entry[1]
+                # File changed (or vanished) since we loaded it
+                del self._models[domain]
+                self.invalidations += 1
+
+            self.misses += 1
+            if mtime is None:
+                return None
+            load_lock = self._load_locks.setdefault(domain, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                # Loaded by another thread while we waited for load_lock
+                entry = self._models.get(domain)
+                if entry is not None and entry[0] == mtime:
+                    self._models.move_to_end(domain)
+                    return entry[1]
+            model = self._loader(domain)
+            if model is None:
+                return None
+            with self._lock:
+                self._models[domain] = (mtime, model)
+                self._models.move_to_end(domain)
+                while len(self._models) > self.capacity:
+                    self._models.popitem(last=False)
+                    self.evictions += 1
+            return model
+
+    def warm(self, domains=None):
+        """
+        Loads models ahead of the first request.
+        Defaults to every domain that has a model file on disk.
+        """
+        if domains is None:
+            domains = available_domains()
+        for domain in domains:
+            self.get(domain)
+
+    def version(self, domains=None):
+        """
+        Fingerprint of the model files on disk for `domains` (default: all).
+        Changes whenever any of them is retrained, so callers can key cached
+        results on it.
+        """
+        if domains is None:
+            domains = available_domains()
+        stamps = [f"{d}:{self._mtime(d)}" for d in sorted(domains)]
+        return hashlib.sha1("|".join(stamps).encode('utf-8')).hexdigest()[:16]
+
+    def invalidate(self, domain=None):
+        """
+        Drops one domain (or everything) from the cache.
+        """
+        with self._lock:
+            if domain is None:
+                self.invalidations += len(self._models)
+                self._models.clear()
+            elif self._models.pop(domain, None) is not None:
+                self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._models),
+                "capacity": self.capacity,
+                "domains": list(self._models.keys())
+            }
+
+def available_domains(model_dir="models"):
+    """
+    Lists the domains that have a trained model in `model_dir` (for the
+    unified format, the domains the unified model was trained on).
+    """
+    if MODEL_FORMAT == "unified":
+        from src.unified_model import load_unified_model
+        model = load_unified_model(os.path.join(model_dir, "unified_model.pkl"))
+        return sorted(model.domains) if model is not None else []
+    if MODEL_FORMAT == "compact":
+        compact_dir = os.path.join(model_dir, "compact")
+        if not os.path.isdir(compact_dir):
+            return []
+        return sorted(d for d in os.listdir(compact_dir) if os.path.exists(os.path.join(compact_dir, d, "meta.json")))
+    if not os.path.isdir(model_dir):
+        return []
+    suffix = "_linear.pkl" if MODEL_FORMAT == "linear" else "_model.pkl"
+    return sorted(f[:-len(suffix)] for f in os.listdir(model_dir)
+                  if f.endswith(suffix) and f != "unified_model.pkl")
+
+# Process-wide registry shared by all scorers
+registry = ModelRegistry()
+
+def get_model(domain):
+    return registry.get(domain)
@@ -1,13 +1,19 @@
-import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.pipeline import make_pipeline
-from sklearn.calibration import CalibratedClassifierCV
 import pickle
 import os
+import time
 import random
-from src.preprocessing import preprocess_text
+from concurrent.futures import ProcessPoolExecutor
+from src.preprocessing import preprocess_text, preprocess_texts, preprocess_cache, PreprocessCache, clean_text
+
+# Which models scoring loads: "per_domain" (one pipeline per models/<domain>_model.pkl),
+# "unified" (models/unified_model.pkl, one shared vocabulary for all domains),
+# "compact" (memory-mapped arrays exported from the per-domain pipelines) or
+# "linear" (fast TF-IDF + logistic regression pipelines, models/<domain>_linear.pkl)
+MODEL_FORMATS = ("per_domain", "unified", "compact", "linear")
+MODEL_FORMAT = os.environ.get("RESUME_MODEL_FORMAT", "per_domain")
+if MODEL_FORMAT not in MODEL_FORMATS:
+    raise ValueError(f"Unknown RESUME_MODEL_FORMAT: {MODEL_FORMAT}")
 
 # Note: We stick to Tfidf + RandomForest for the ML Component as requested.
 # SBERT is used for the "Semantic Similarity" component in scoring.py, 
@@ -44,40 +50,230 @@ def generate_synthetic_data(target_jd, other_jds, n_samples=50):
 
     return data, labels
 
-def train_model(domain, jd_text, all_jds_dict):
-    other_jds = [text for d, text in all_jds_dict.items() if d != domain]
-    
-    print(f"Generating synthetic data for {domain}...")
-    X_text, y = generate_synthetic_data(jd_text, other_jds)
-    
-    # Create Pipeline with Calibration
+def build_model(n_jobs=None):
+    """
+    Untrained domain pipeline: TF-IDF (with the spaCy preprocessor) into a
+    sigmoid-calibrated Random Forest.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import make_pipeline
+    from sklearn.calibration import CalibratedClassifierCV
     # CalibratedClassifierCV allows us to get better probability estimates
-    base_rf = RandomForestClassifier(n_estimators=100, random_state=42)
+    base_rf = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
     calibrated_rf = CalibratedClassifierCV(base_rf, method='sigmoid')
     
-    model = make_pipeline(
+    return make_pipeline(
         TfidfVectorizer(stop_words='english', preprocessor=preprocess_text),
         calibrated_rf
     )
+
+def build_linear_model():
+    """
+    Untrained fast domain pipeline: TF-IDF into a logistic regression.
+    Inference is one sparse dot product per batch, which makes it suited to
+    high-volume pre-screening; the probabilities are the model's own.
+    Text goes through clean_text rather than the spaCy preprocessor, so
+    neither training nor scoring this family loads spaCy.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import make_pipeline
+    from sklearn.linear_model import LogisticRegression
+    return make_pipeline(
+        TfidfVectorizer(stop_words='english', preprocessor=clean_text, sublinear_tf=True),
+        LogisticRegression(C=10.0, max_iter=1000)
+    )
+
+def _set_forest_n_jobs(calibrated, n_jobs):
+    # n_jobs is pickled with the forests; scoring predicts a handful of rows
+    # at a time, where spinning up threads costs more than it saves
+    calibrated.estimator.n_jobs = n_jobs
+    for classifier in getattr(calibrated, "calibrated_classifiers_", []):
+        classifier.estimator.n_jobs = n_jobs
+
+def fit_and_save(domain, X_text, y, n_jobs=None, cv=3, model_format="per_domain"):
+    """
+    Cross-validates, fits and saves one domain model.
+    model_format "linear" trains the fast logistic regression family instead
+    of the calibrated forest.
     
-    print(f"Training calibrated model for {domain}...")
+    Returns:
+        tuple: (model, mean CV accuracy)
+    """
+    linear = model_format == "linear"
+    model = build_linear_model() if linear else build_model(n_jobs)
     
     # Optional: Print CV Score for verification
     from sklearn.model_selection import cross_val_score
-    cv_scores = cross_val_score(model, X_text, y, cv=3)
-    print(f"  -> CV Accuracy: {np.mean(cv_scores):.2f}")
+    cv_scores = cross_val_score(model, X_text, y, cv=cv)
     
     model.fit(X_text, y)
+    if not linear:
+        _set_forest_n_jobs(model[-1], None)
     
     # Save model
-    model_path = f"models/{domain}_model.pkl"
+    model_path = get_model_path(domain, "linear" if linear else "per_domain")
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
     with open(model_path, 'wb') as f:
         pickle.dump(model, f)
+    return model, float(np.mean(cv_scores))
+
+def train_model(domain, jd_text, all_jds_dict):
+    other_jds = [text for d, text in all_jds_dict.items() if d != domain]
+    
+    print(f"Generating synthetic data for {domain}...")
+    X_text, y = generate_synthetic_data(jd_text, other_jds)
+    
+    print(f"Training calibrated model for {domain}...")
+    model, cv_accuracy = fit_and_save(domain, X_text, y)
+    print(f"  -> CV Accuracy: {cv_accuracy:.2f}")
     return model
 
-def load_model(domain):
-    model_path = f"models/{domain}_model.pkl"
+def _init_training_worker(lemmatized):
+    # Seed this worker's preprocess cache with the corpus the parent already
+    # lemmatized, so CV folds and the final fit never run spaCy
+    preprocess_cache.configure(maxsize=max(preprocess_cache.maxsize, len(lemmatized)))
+    for key, value in lemmatized.items():
+        preprocess_cache.put(key, value)
+
+def _train_domain_task(domain, X_text, y, n_jobs, model_format):
+    start = time.perf_counter()
+    _, cv_accuracy = fit_and_save(domain, X_text, y, n_jobs, model_format=model_format)
+    return domain, cv_accuracy, time.perf_counter() - start
+
+def train_all_models(all_jds_dict, domains=None, workers=None, n_samples=50, seed=None, model_format="per_domain"):
+    """
+    Trains every domain model in parallel.
+    
+    The synthetic corpus for all domains is generated up front and
+    lemmatized once with a single spaCy batch; each worker process starts
+    with those results in its preprocess cache, so cross-validation and the
+    final fit only pay for TF-IDF and the forests. Cores left over after one
+    process per domain are given to the forests (n_jobs).
+    
+    Args:
+        all_jds_dict (dict): {domain: jd_text} for every role (negatives are drawn from all of them).
+        domains (list): Domains to train (default: all).
+        workers (int): Worker processes (default: min(CPU count, domains); 1 trains in-process).
+        n_samples (int): Positive (and negative) synthetic resumes per domain.
+        seed (int): Seed for the synthetic data, for reproducible models.
+        model_format (str): "per_domain" (calibrated forests) or "linear".
+        
+    Returns:
+        dict: {domain: {"cv_accuracy": float, "seconds": float}} plus a
+              "_total" entry with the overall wall time.
+    """
+    start = time.perf_counter()
+    domains = list(domains or all_jds_dict.keys())
+    if seed is not None:
+        random.seed(seed)
+        
+    corpus = {}
+    for domain in domains:
+        other_jds = [text for d, text in all_jds_dict.items() if d != domain]
+        corpus[domain] = generate_synthetic_data(all_jds_dict[domain], other_jds, n_samples)
+        
+    lemmatized = {}
+    if model_format != "linear":
+        texts = list(dict.fromkeys(t for X_text, _ in corpus.values() for t in X_text))
+        lemmatized = dict(zip((PreprocessCache.key(t) for t in texts), preprocess_texts(texts)))
+        print(f"Lemmatized {len(texts)} synthetic resumes in {time.perf_counter() - start:.1f}s")
+    
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(workers or cpus, len(domains)))
+    n_jobs = max(1, cpus // workers)
+    report = {}
+    
+    def record(domain, cv_accuracy, seconds):
+        report[domain] = {"cv_accuracy": round(cv_accuracy, 4), "seconds": round(seconds, 2)}
+        print(f"  {domain}: CV Accuracy {cv_accuracy:.2f} ({seconds:.1f}s)")
+        
+    trained = False
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_training_worker,
+                                     initargs=(lemmatized,)) as pool:
+                futures = [pool.submit(_train_domain_task, d, *corpus[d], n_jobs, model_format) for d in domains]
+                for future in futures:
+                    record(*future.result())
+            trained = True
+        except (OSError, RuntimeError) as e:
+            # e.g. no subprocesses allowed here; train in-process instead
+            print(f"Parallel training failed, falling back to serial: {e}")
+    if not trained:
+        _init_training_worker(lemmatized)
+        for d in domains:
+            record(*_train_domain_task(d, *corpus[d], cpus, model_format))
+            
+    report["_total"] = {"seconds": round(time.perf_counter() - start, 2)}
+    return report
+
+def get_model_path(domain, model_format=None):
+    """
+    File the model for a domain is served from: its own pickle, the shared
+    unified model, or the compact export's meta.json, depending on
+    model_format (default MODEL_FORMAT).
+    """
+    model_format = model_format or MODEL_FORMAT
+    if model_format == "unified":
+        from src.unified_model import UNIFIED_MODEL_PATH
+        return UNIFIED_MODEL_PATH
+    if model_format == "compact":
+        from src.compact_model import COMPACT_DIR
+        return os.path.join(COMPACT_DIR, domain, "meta.json")
+    if model_format == "linear":
+        return f"models/{domain}_linear.pkl"
+    return f"models/{domain}_model.pkl"
+
+def _load_pickle(domain, model_format="per_domain"):
+    model_path = get_model_path(domain, model_format)
     if os.path.exists(model_path):
         with open(model_path, 'rb') as f:
             return pickle.load(f)
     return None
+
+def load_model(domain):
+    """
+    Unpickles the model for a domain straight from disk.
+    Scorers should go through src.model_registry instead, which keeps
+    loaded models in memory between calls.
+    
+    With MODEL_FORMAT "unified" this returns a per-domain view of the shared
+    unified model (None if it wasn't trained with this domain), with
+    "compact" a memory-mapped CompactModel, and with "linear" the fast
+    logistic regression pipeline.
+    """
+    if MODEL_FORMAT == "unified":
+        from src.unified_model import load_unified_model
+        model = load_unified_model()
+        if model is None or domain not in model.domains:
+            return None
+        return model.view(domain)
+    if MODEL_FORMAT == "compact":
+        from src.compact_model import CompactModel
+        model_path = get_model_path(domain)
+        if os.path.exists(model_path):
+            return CompactModel.open(os.path.dirname(model_path))
+        return None
+    return _load_pickle(domain, MODEL_FORMAT)
+
+def export_compact_models(domains=None, out_dir=None):
+    """
+    Exports trained per-domain pipelines to the compact, memory-mappable
+    format (see src.compact_model), one directory per domain.
+    
+    Returns:
+        list: Domains exported.
+    """
+    from src.compact_model import write_compact, COMPACT_DIR
+    from src.model_registry import available_domains
+    out_dir = out_dir or COMPACT_DIR
+    exported = []
+    for domain in domains or available_domains():
+        model = _load_pickle(domain)
+        if model is None:
+            print(f"No trained model for {domain}, skipping export.")
+            continue
+        write_compact(model, os.path.join(out_dir, domain))
+        exported.append(domain)
+    return exported
@@ -0,0 +1,124 @@
+from src.section_extraction import find_sections
+
+def get_section_weights(is_fresher):
+    """
+    Section weights for the weighted score. Freshers are judged on skills and
+    projects rather than work experience.
+    """
+    if is_fresher:
+        return {
+            "skills": 0.45,
+            "projects": 0.30,
+            "education": 0.15,
+            "certifications": 0.10,
+            "experience": 0.00
+        }
+    return {
+        "skills": 0.40,
+        "experience": 0.25,
+        "projects": 0.20,
+        "education": 0.10,
+        "certifications": 0.05
+    }
+
+def _model_rows(resume_text, sections_dict):
+    """
+    The texts a domain model scores for one resume: the full text (named
+    None, skipped if resume_text is None) followed by every non-empty
+    weighted section. Returns (names, texts).
+    """
+    weights = get_section_weights(sections_dict.get("is_fresher", False))
+    names = [s for s, w in weights.items() if w != 0 and sections_dict.get(s, "").strip()]
+    texts = [sections_dict[s] for s in names]
+    if resume_text is not None:
+        # The full text rides along as the first row
+        names = [None] + names
+        texts = [resume_text] + texts
+    return names, texts
+
+class ParsedResume:
+    """
+    Everything derived from one resume's text, computed once per document.
+
+    Holds the raw and lowercased text, the extract_sections dictionary (and
+    its offsets when parsed here rather than loaded from the extraction
+    cache), the fresher flag, and lazily the extracted skill set, the texts
+    the domain models score and the resume embeddings per mode. Scoring,
+    skill gap and fresher detection accept it in place of the raw string,
+    so scoring a resume against many domains parses it only once.
+    """
+    __slots__ = ("text", "lower", "spans", "sections", "is_fresher", "embeddings",
+                 "_skills", "_rows", "_preprocessed")
+
+    def __init__(self, text, sections=None):
+        """
+        Args:
+            text (str): Extracted resume text.
+            sections (dict): extract_sections output if already known (e.g.
+                from the extraction cache); otherwise the text is scanned here.
+        """
+        self.text = text
+        if sections is None:
+            self.spans = find_sections(text)
+            self.lower = self.spans.text
+            self.sections = self.spans.to_dict()
+        else:
+            self.spans = None
+            self.lower = text.lower()
+            self.sections = sections
+        self.is_fresher = self.sections.get("is_fresher", False)
+        # {embedding mode: vector}, filled by src.scoring
+        self.embeddings = {}
+        self._skills = None
+        self._rows = None
+        self._preprocessed = False
+
+    @property
+    def skills(self):
+        """
+        Canonical skills found in the resume (see skill_gap.extract_skills).
+        """
+        if self._skills is None:
+            from src.skill_gap import get_skill_matcher
+            self._skills = get_skill_matcher().extract(self.lower)
+        return self._skills
+
+    def model_rows(self):
+        """
+        The texts a domain model scores: the full text (named None) followed
+        by every non-empty section the resume's section weights use.
+        Returns (names, texts).
+        """
+        if self._rows is None:
+            self._rows = _model_rows(self.text, self.sections)
+        return self._rows
+
+    def mark_preprocessed(self):
+        """
+        Returns False the first time it is called, True afterwards; lets
+        callers lemmatize the model rows once however many domains score them.
+        """
+        done, self._preprocessed = self._preprocessed, True
+        return done
+
+def parse_resume(resume, sections=None):
+    """
+    Returns resume unchanged if it is already a ParsedResume, otherwise
+    parses the text (reusing sections if given).
+    """
+    if isinstance(resume, ParsedResume):
+        return resume
+    return ParsedResume(resume, sections)
+
+if __name__ == "__main__":
+    sample = """
+    Jane Doe
+    Technical Skills
+    Python, SQL, Tableau
+    Experience
+    Data Analyst at Acme Corp, 3 years.
+    """
+    parsed = parse_resume(sample)
+    print("Sections:", {k: v for k, v in parsed.sections.items() if v})
+    print("Fresher:", parsed.is_fresher)
+    print("Skills:", sorted(parsed.skills))
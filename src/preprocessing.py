@@ -1,19 +1,161 @@
-import spacy
 import re
-import sys
+import hashlib
+import threading
+from collections import OrderedDict
 
-# Try to load the model, ignore if not found (will be handled by runner or user)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Spacy model 'en_core_web_sm' not found. Please run: python -m spacy download en_core_web_sm")
-    nlp = None
+# Components of en_core_web_sm that lemmatization never reads. The tagger and
+# attribute_ruler stay: the rule-based lemmatizer depends on their POS tags.
+UNUSED_COMPONENTS = ["parser", "ner"]
+
+# Upper bound on the (token, POS, morph) -> lemma memo
+LEMMA_CACHE_SIZE = 50000
+
+# Default batch size for nlp.pipe in preprocess_texts
+PIPE_BATCH_SIZE = 64
+
+# Entries kept by the shared preprocess_text output cache
+PREPROCESS_CACHE_SIZE = 4096
+# Keys remembered for the `recomputed` counter, oldest forgotten first; bounds
+# its memory in long-running processes (16-byte digests, so about 1 MB)
+COMPUTED_HISTORY_SIZE = 65536
+
+# Loaded on first use by load_nlp(), so importing this module (which every
+# pickled pipeline does through preprocess_text) doesn't pay for spaCy
+nlp = None
+_nlp_available = None # None until the first load attempt
+_nlp_lock = threading.Lock()
+
+_lemma_cache = OrderedDict()
+
+class PreprocessCache:
+    """
+    Bounded, content-addressed cache of preprocess_text output.
+
+    Every domain pipeline pickles a reference to preprocess_text as its TF-IDF
+    preprocessor, so the same resume text reaches it once per domain. Keying
+    on a digest of the text lets all of them share one result.
+
+    policy is "lru" (hits refresh an entry) or "fifo" (entries expire in
+    insertion order regardless of use).
+    """
+    POLICIES = ("lru", "fifo")
+
+    def __init__(self, maxsize=PREPROCESS_CACHE_SIZE, policy="lru"):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.configure(maxsize, policy)
+        self.reset_stats()
+
+    def configure(self, maxsize=None, policy=None):
+        if maxsize is not None:
+            if maxsize < 0:
+                raise ValueError("maxsize must be >= 0")
+            self.maxsize = maxsize
+        if policy is not None:
+            if policy not in self.POLICIES:
+                raise ValueError(f"Unknown eviction policy: {policy}")
+            self.policy = policy
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def key(text):
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                if key in self._computed:
+                    self.recomputed += 1
+                    self._computed.move_to_end(key)
+                else:
+                    self._computed[key] = None
+                    if len(self._computed) > COMPUTED_HISTORY_SIZE:
+                        self._computed.popitem(last=False)
+                return None
+            self.hits += 1
+            if self.policy == "lru":
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self):
+        """
+        Zeroes the counters, e.g. at the start of a request.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Texts preprocessed more than once since the last reset (evicted too
+        # early), among the last COMPUTED_HISTORY_SIZE distinct misses
+        self.recomputed = 0
+        self._computed = OrderedDict()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "recomputed": self.recomputed,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "policy": self.policy
+            }
+
+# Shared by every caller of preprocess_text, including the pickled pipelines
+preprocess_cache = PreprocessCache()
 
 def download_spacy_model():
+    import spacy
     from spacy.cli import download
     download("en_core_web_sm")
-    global nlp
-    nlp = spacy.load("en_core_web_sm")
+    global nlp, _nlp_available
+    nlp = spacy.load("en_core_web_sm", exclude=UNUSED_COMPONENTS)
+    _nlp_available = True
+    _lemma_cache.clear()
+    preprocess_cache.clear()
+
+def load_nlp():
+    """
+    Returns the spaCy pipeline, loading it on first call (and downloading
+    en_core_web_sm if it isn't installed). Returns None if spaCy can't be
+    loaded; that outcome is remembered, so the download is attempted once.
+    """
+    global nlp, _nlp_available
+    if _nlp_available is None:
+        with _nlp_lock:
+            if _nlp_available is None:
+                try:
+                    import spacy
+                    nlp = spacy.load("en_core_web_sm", exclude=UNUSED_COMPONENTS)
+                    _nlp_available = True
+                except ImportError:
+                    print("spaCy is not installed; falling back to basic text cleaning.")
+                    _nlp_available = False
+                except OSError:
+                    print("Spacy model 'en_core_web_sm' not found. Attempting: python -m spacy download en_core_web_sm")
+                    try:
+                        download_spacy_model()
+                    except (Exception, SystemExit):
+                        # spacy.cli.download calls sys.exit when the download or pip fails
+                        _nlp_available = False
+    return nlp if _nlp_available else None
 
 def clean_text(text):
     """
@@ -25,19 +167,107 @@ def clean_text(text):
     text = re.sub(r'\s+', ' ', text).strip() # remove extra whitespace
     return text
 
-def preprocess_text(text):
+def _ensure_nlp():
     """
-    Advanced preprocessing: lemmatization, stopword removal using Spacy.
+    Returns False if spaCy is unavailable and callers should fall back to clean_text.
+    """
+    return load_nlp() is not None
+
+def _lemmatizer():
+    """
+    Returns spaCy's Lemmatizer component, or None if the pipeline lemmatizes
+    some other way (then the component runs as usual and the memo is unused).
     """
-    if nlp is None:
-        # Fallback or attempt download
-        try:
-            download_spacy_model()
-        except:
-            return clean_text(text) # Fallback to basic cleaning if model fails
+    from spacy.pipeline import Lemmatizer
+    if "lemmatizer" in nlp.pipe_names:
+        pipe = nlp.get_pipe("lemmatizer")
+        if isinstance(pipe, Lemmatizer):
+            return pipe
+    return None
 
-    cleaned = clean_text(text)
-    doc = nlp(cleaned)
+def _lemma(token, lemmatizer):
+    # Mirrors the lemmatizer component, which keeps a lemma an earlier
+    # component (the attribute_ruler) already set unless told to overwrite.
+    if token.lemma != 0 and not lemmatizer.overwrite:
+        return token.lemma_
+    # Same key spaCy's rule lemmatizer uses for its own cache
+    key = (token.orth, token.pos, token.morph.key)
+    lemma = _lemma_cache.get(key)
+    if lemma is None:
+        lemma = lemmatizer.lemmatize(token)[0]
+        _lemma_cache[key] = lemma
+        if len(_lemma_cache) > LEMMA_CACHE_SIZE:
+            _lemma_cache.popitem(last=False)
+    return lemma
+
+def _doc_to_text(doc, lemmatizer):
     # Remove stopwords and punctuation, and use lemmas
-    tokens = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
+    if lemmatizer is None:
+        tokens = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
+    else:
+        tokens = [_lemma(token, lemmatizer) for token in doc if not token.is_stop and not token.is_punct]
     return " ".join(tokens)
+
+def _disabled_components(lemmatizer):
+    # With the memo in place the lemmatizer component itself can be skipped
+    return ["lemmatizer"] if lemmatizer is not None else []
+
+def preprocess_text(text):
+    """
+    Advanced preprocessing: lemmatization, stopword removal using Spacy.
+    Results are shared through preprocess_cache.
+    """
+    if not _ensure_nlp():
+        return clean_text(text) # Fallback to basic cleaning if model fails
+
+    key = PreprocessCache.key(text)
+    result = preprocess_cache.get(key)
+    if result is None:
+        cleaned = clean_text(text)
+        lemmatizer = _lemmatizer()
+        doc = nlp(cleaned, disable=_disabled_components(lemmatizer))
+        result = _doc_to_text(doc, lemmatizer)
+        preprocess_cache.put(key, result)
+    return result
+
+def preprocess_texts(texts, batch_size=PIPE_BATCH_SIZE, n_process=1):
+    """
+    Batch version of preprocess_text built on nlp.pipe.
+    Only texts missing from preprocess_cache are run through spaCy, each once.
+
+    Args:
+        texts (iterable): Raw texts.
+        batch_size (int): Documents per nlp.pipe batch.
+        n_process (int): Worker processes for nlp.pipe (1 = in-process).
+
+    Returns:
+        list: Preprocessed strings, identical to calling preprocess_text on each text.
+    """
+    texts = list(texts)
+    if not _ensure_nlp():
+        return [clean_text(t) for t in texts]
+
+    keys = [PreprocessCache.key(t) for t in texts]
+    results = {}
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key in results or key in pending:
+            continue
+        cached = preprocess_cache.get(key)
+        if cached is None:
+            pending[key] = text
+        else:
+            results[key] = cached
+
+    if pending:
+        lemmatizer = _lemmatizer()
+        docs = nlp.pipe(
+            (clean_text(t) for t in pending.values()),
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=_disabled_components(lemmatizer)
+        )
+        for key, doc in zip(pending.keys(), docs):
+            results[key] = _doc_to_text(doc, lemmatizer)
+            preprocess_cache.put(key, results[key])
+    return [results[key] for key in keys]
@@ -1,16 +1,31 @@
 import re
+from functools import lru_cache
+from src.skill_gap import extract_skills
+from src.parsed_resume import ParsedResume
+from src.section_extraction import extract_sections
+from src.skill_taxonomy import get_skill_index
 
-def detect_fresher(resume_text, sections):
+def detect_fresher(resume_text, sections=None):
     """
     Returns True if the candidate is likely a refresher.
     Logic: Keywords 'student', 'fresher', or empty/short Experience section.
+    resume_text may be a ParsedResume, whose lowercased text (and sections,
+    unless given) are reused; for a plain string without sections they are
+    extracted here.
     """
-    text = resume_text.lower()
+    if isinstance(resume_text, ParsedResume):
+        text = resume_text.lower
+        if sections is None:
+            sections = resume_text.sections
+    else:
+        text = resume_text.lower()
+        if sections is None:
+            sections = extract_sections(resume_text)
     if 'fresher' in text or 'recent graduate' in text or 'student' in text:
         return True
     
     # Check for numeric experience indications
-    exp_text = sections.get("Experience", "")
+    exp_text = sections.get("experience", "")
     
     # Regex for "X years", "X+ years", "X yrs"
     # If NO numeric experience pattern found in employment history, likely fresher
@@ -19,36 +34,54 @@ def detect_fresher(resume_text, sections):
         
     return False
 
-def get_missing_skills(resume_text, jd_text):
+@lru_cache(maxsize=256)
+def _required_skills(jd_text):
     """
-    Simple skill gap analysis. 
-    Extracts potential skills from JD (capitalized words or specific list) and checks if they are in Resume.
+    Skills listed on the JD's "Required Skills:" line, parsed once per JD text.
     """
-    # In a real app, use a predefined database of 1000+ tech skills.
-    # Here, we use a heuristic: extract keywords from JD that look like skills.
-    # For better accuracy, we can load the 'Required Skills' line from our JD files.
-    
     # Let's try to extract from "Required Skills:" line in JD if possible
-    skills_needed = set()
+    skills_needed = []
     
     # Regex to find "Required Skills: ..."
     match = re.search(r"required skills:(.*?)(\n|$)", jd_text.lower())
     if match:
         raw_skills = match.group(1)
-        # Split by comma
-        tokens = [s.strip() for s in raw_skills.split(',')]
+        # Split by comma (the line usually ends with a full stop)
+        tokens = [s.strip() for s in raw_skills.strip().rstrip('.').split(',')]
         for t in tokens:
-            if t: skills_needed.add(t)
+            if t and t not in skills_needed: skills_needed.append(t)
     else:
         # Fallback: simple Noun chunks or just specific keywords? 
         # Let's stick to the structured JD format we created.
         pass
+    return tuple(skills_needed)
+
+def get_missing_skills(resume_text, jd_text):
+    """
+    Simple skill gap analysis. 
+    Takes the skills from the JD's "Required Skills:" line and checks which are absent from the Resume.
+    Skills known to the taxonomy are matched through the skills index, so aliases count
+    (a resume saying "sklearn" covers "Scikit-learn"); anything else falls back to a substring check.
+    resume_text may be a ParsedResume, whose lowercased text and skill set are reused.
+    """
+    skills_needed = _required_skills(jd_text)
         
     # Check what is missing
-    resume_lower = resume_text.lower()
+    index = get_skill_index()
+    if isinstance(resume_text, ParsedResume):
+        resume_lower = resume_text.lower
+        resume_skills = resume_text.skills if skills_needed else set()
+    else:
+        resume_lower = resume_text.lower()
+        resume_skills = extract_skills(resume_text) if skills_needed else set()
     missing = []
     for skill in skills_needed:
-        if skill not in resume_lower:
+        canonical = index.canonicalize(skill) if index is not None else None
+        if canonical is not None:
+            found = canonical in resume_skills
+        else:
+            found = skill in resume_lower
+        if not found:
             missing.append(skill.title())
             
     return missing
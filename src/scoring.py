@@ -1,42 +1,120 @@
-from src.model_training import load_model, train_model
+import threading
+import numpy as np
+from collections import OrderedDict
+from src.model_registry import get_model, registry
+from src.model_training import MODEL_FORMAT
 from src.section_extraction import extract_sections
+from src.parsed_resume import ParsedResume, parse_resume, get_section_weights, _model_rows
 from src.feature_engineering import FeatureEngineer
-from src.recommendations import detect_fresher, get_missing_skills
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+from src.recommendations import get_missing_skills
+from src.preprocessing import preprocess_texts, load_nlp
+from src.jd_index import JDEmbeddingIndex, _normalize_rows, text_hash
+from src.encoder import get_encoder
+from src.skill_taxonomy import get_skill_index
 
 # Global Feature Engineer to share SBERT model and TFIDF
 fe = FeatureEngineer()
 
-def calculate_weighted_score(sections_dict, domain):
+# How the resume is embedded for the semantic component:
+# "full" encodes the whole text (truncated at the model's token limit),
+# "chunked" encodes every section/token window and mean-pools them.
+EMBEDDING_MODE = "full"
+
+# The linear models clean their own input; every other format reads the
+# spaCy lemmas that scoring batches into preprocess_cache up front
+LEMMATIZE = MODEL_FORMAT != "linear"
+
+# Persisted JD embeddings, built from data/job_descriptions on first use
+jd_index = JDEmbeddingIndex(get_encoder)
+
+# Embeddings of JDs the index doesn't hold (--jd-dir roles, ad-hoc
+# requisitions), keyed by text hash and kept LRU, so each is encoded once
+# per process rather than once per resume
+JD_MEMO_SIZE = 256
+_jd_memo = OrderedDict()
+_jd_memo_lock = threading.Lock()
+
+def warmup(domains=None):
+    """
+    Loads everything scoring needs ahead of the first request: the domain
+    models (default: every trained domain), spaCy, the sentence encoder, the
+    JD embedding index and the skills index. Importing this module loads
+    none of them; without a warmup each is loaded on first use.
+    """
+    registry.warm(domains)
+    if LEMMATIZE:
+        load_nlp()
+    fe.load_sbert()
+    jd_index.refresh()
+    get_skill_index()
+
+def _predict_rows(model, names, texts):
+    """
+    Probability of class 1 (Good Match) for each text, from one predict_proba call.
+    """
+    try:
+        return list(model.predict_proba(texts)[:, 1])
+    except Exception:
+        # Score one by one so a single bad text doesn't zero the others
+        probas = []
+        for name, text in zip(names, texts):
+            try:
+                probas.append(model.predict_proba([text])[0][1])
+            except Exception as e:
+                if name is not None:
+                    print(f"Error scoring section {name}: {e}")
+                probas.append(0.0)
+        return probas
+
+def predict_probas(model, resume_text, sections_dict):
+    """
+    Scores the full resume text and every non-empty weighted section with a
+    single predict_proba call, instead of one call per text.
+    
+    Args:
+        model: Fitted domain pipeline.
+        resume_text (str, ParsedResume or None): Full text; skipped if None.
+            A ParsedResume brings its own sections and cached rows.
+        sections_dict (dict): Output of extract_sections (ignored for a ParsedResume).
+        
+    Returns:
+        tuple: (ml_proba, section_probs) where ml_proba is the full-text
+               probability (None if resume_text is None) and section_probs
+               maps section name -> probability for the sections scored.
+    """
+    if isinstance(resume_text, ParsedResume):
+        names, texts = resume_text.model_rows()
+    else:
+        names, texts = _model_rows(resume_text, sections_dict)
+    if not texts:
+        return None, {}
+        
+    section_probs = dict(zip(names, _predict_rows(model, names, texts)))
+    ml_proba = section_probs.pop(None, None)
+    return ml_proba, section_probs
+
+def calculate_weighted_score(sections_dict, domain, section_probs=None):
     """
     Calculates the weighted score using domain-specific ML model on sections.
+    
+    section_probs can carry probabilities already computed by predict_probas,
+    in which case the model is not called again. sections_dict may also be a
+    ParsedResume.
     """
-    # 1. Load Model
-    model = load_model(domain)
-    if model is None:
-        # Fallback if model not found, though ideally shouldn't happen
-        return {"final_score": 0, "section_scores": {}}
+    if isinstance(sections_dict, ParsedResume):
+        sections_dict = sections_dict.sections
+    if section_probs is None:
+        # 1. Load Model (cached in-process by the registry)
+        model = get_model(domain)
+        if model is None:
+            # Fallback if model not found, though ideally shouldn't happen
+            return {"final_score": 0, "section_scores": {}}
+        _, section_probs = predict_probas(model, None, sections_dict)
 
     is_fresher = sections_dict.get("is_fresher", False)
     
     # 2. Define Weights
-    if is_fresher:
-        weights = {
-            "skills": 0.45,
-            "projects": 0.30,
-            "education": 0.15,
-            "certifications": 0.10,
-            "experience": 0.00
-        }
-    else:
-        weights = {
-            "skills": 0.40,
-            "experience": 0.25,
-            "projects": 0.20,
-            "education": 0.10,
-            "certifications": 0.05
-        }
+    weights = get_section_weights(is_fresher)
         
     section_scores = {}
     weighted_sum = 0
@@ -48,19 +126,8 @@ def calculate_weighted_score(sections_dict, domain):
             section_scores[section] = 0.0
             continue
             
-        text = sections_dict.get(section, "")
-        if not text.strip():
-            # Empty section
-            prob = 0.0
-        else:
-            try:
-                # Predict probability for this section text
-                # The model expects a list/iterable of strings
-                prob = model.predict_proba([text])[0][1] # Probability of class 1 (Good Match)
-            except Exception as e:
-                # Fallback or error logging
-                print(f"Error scoring section {section}: {e}")
-                prob = 0.0
+        # Sections missing from section_probs were empty
+        prob = section_probs.get(section, 0.0)
         
         section_scores[section] = round(prob, 2)
         weighted_sum += prob * weight
@@ -83,42 +150,59 @@ def get_match_level(score):
     if score >= 41: return "Moderate Match"
     return "Low Match"
 
-def calculate_composite_score(resume_text, jd_text, domain):
-    # 1. Load Model & Predict Global ML Probability (Overall feel)
-    model = load_model(domain)
+def combine_scores(ml_proba, semantic_sim, weighted_result):
+    section_final_score = weighted_result["final_score"] # 0-100 scale
+    
+    # Normalize section score to 0-1 for the composite formula
+    section_score_norm = section_final_score / 100.0
+    
+    # Formula: 0.4 * ML + 0.3 * Semantic + 0.3 * Section
+    final_score = (0.4 * ml_proba) + (0.3 * semantic_sim) + (0.3 * section_score_norm)
+    return round(final_score * 100, 2)
+
+def get_resume_embedding(resume_text, embedding_mode=None):
+    """
+    Embeds a resume (str or ParsedResume) for the semantic component. A
+    ParsedResume keeps its embedding, so it is encoded once per mode.
+    """
+    embedding_mode = embedding_mode or EMBEDDING_MODE
+    if isinstance(resume_text, ParsedResume):
+        embedding = resume_text.embeddings.get(embedding_mode)
+        if embedding is None:
+            embedding = get_resume_embedding(resume_text.text, embedding_mode)
+            resume_text.embeddings[embedding_mode] = embedding
+        return embedding
+    if embedding_mode == "full":
+        return fe.get_sbert_embedding(resume_text)
+    if embedding_mode == "chunked":
+        return fe.get_chunked_embedding(resume_text)[0]
+    raise ValueError(f"Unknown embedding mode: {embedding_mode}")
+
+def calculate_composite_score(resume_text, jd_text, domain, embedding_mode=None):
+    # resume_text may be a ParsedResume; scoring it against another domain then reuses its parse
+    resume = parse_resume(resume_text)
+    
+    # 1. Load Model (the global ML probability is predicted with the sections below)
+    model = get_model(domain)
     if model is None:
         # Attempt to train if missing? Or just return 0
         return 0, "Model not trained", [], {}, False
         
-    try:
-        # Overall text score
-        ml_proba = model.predict_proba([resume_text])[0][1] 
-    except:
-        ml_proba = 0
-
     # 2. Semantic Similarity (Full Text) using SBERT
-    resume_emb = fe.get_sbert_embedding(resume_text)
-    jd_emb = fe.get_sbert_embedding(jd_text)
-    semantic_sim = fe.calculate_cosine_similarity(resume_emb, jd_emb) 
+    resume_emb = get_resume_embedding(resume, embedding_mode)
+    semantic_sim = semantic_similarities(resume_emb, {domain: jd_text})[domain]
     
     # 3. Section Weighted Score (New Logic)
-    sections = extract_sections(resume_text)
-    # Note: extract_sections already returns 'is_fresher'. 
-    # The dedicated detect_fresher function in recommendations might be redundant or complementary.
-    # The user asked to use extract_sections output.
-    weighted_result = calculate_weighted_score(sections, domain)
-    section_final_score = weighted_result["final_score"] # 0-100 scale
-    
-    # Normalize section score to 0-1 for the composite formula
-    section_score_norm = section_final_score / 100.0
+    sections = resume.sections
+    # Overall text and all sections go through the model in one batch
+    ml_proba, section_probs = predict_probas(model, resume, sections)
+    weighted_result = calculate_weighted_score(sections, domain, section_probs)
     
     # 4. Final Composite Score
-    # Formula: 0.4 * ML + 0.3 * Semantic + 0.3 * Section
-    final_score = (0.4 * ml_proba) + (0.3 * semantic_sim) + (0.3 * section_score_norm)
-    final_score = round(final_score * 100, 2)
+    final_score = combine_scores(ml_proba, semantic_sim, weighted_result)
     
     match_level = get_match_level(final_score)
-    missing_skills = get_missing_skills(resume_text, jd_text)
+    missing_skills = get_missing_skills(resume, jd_text)
     
     # We return 'sections' which is the raw text, maybe we want to attach valid scores to it for UI?
     # app.py expects 'sections' to be the dict of texts. 
@@ -129,7 +213,196 @@ def calculate_composite_score(resume_text, jd_text, domain):
     # If we want to show scores, we'd need to change app.py or pass a richer object.
     # For now, keeping contract same.
     
-    return final_score, match_level, missing_skills, sections, sections.get("is_fresher", False)
+    return final_score, match_level, missing_skills, sections, resume.is_fresher
+
+def jd_vectors(jds, jd_embeddings=None):
+    """
+    Normalized JD embeddings, one row per JD in jds order.
+    
+    JDs whose text matches the persisted index are read from it; any others
+    (e.g. edited in memory, or an ad-hoc requisition) come from
+    jd_embeddings ({domain: vector}) if given, else from a per-process memo
+    of earlier encodes; whatever is left is encoded in a single batch.
+    """
+    snapshot = jd_index.snapshot()
+    rows = {d: jd_index.lookup(d, text, snapshot) for d, text in jds.items()}
+    vectors = {d: snapshot[2][row] for d, row in rows.items() if row is not None}
+    jd_embeddings = jd_embeddings or {}
+    vectors.update((d, jd_embeddings[d]) for d in jds if d not in vectors and d in jd_embeddings)
+    unindexed = [d for d in jds if d not in vectors]
+    if unindexed:
+        keys = {d: text_hash(jds[d]) for d in unindexed}
+        with _jd_memo_lock:
+            for d in unindexed:
+                if keys[d] in _jd_memo:
+                    _jd_memo.move_to_end(keys[d])
+                    vectors[d] = _jd_memo[keys[d]]
+        pending = [d for d in unindexed if d not in vectors]
+        if pending:
+            encoded = fe.get_sbert_embeddings([jds[d] for d in pending])
+            vectors.update(zip(pending, encoded))
+            with _jd_memo_lock:
+                for d, vector in zip(pending, encoded):
+                    _jd_memo[keys[d]] = vector
+                while len(_jd_memo) > JD_MEMO_SIZE:
+                    _jd_memo.popitem(last=False)
+    return _normalize_rows(np.vstack([vectors[d] for d in jds]))
+
+def semantic_similarities(resume_emb, jds, refresh=True, jd_embeddings=None):
+    """
+    Cosine similarity of a resume embedding against each JD, as one
+    matrix-vector product over jd_vectors(jds, jd_embeddings).
+    
+    refresh checks the JD directory for edits first (a listing and a stat
+    per JD); callers comparing many embeddings refresh once and pass False.
+    
+    Returns:
+        dict: {domain: similarity}
+    """
+    if not jds:
+        return {}
+    if refresh:
+        jd_index.refresh()
+    query = _normalize_rows(np.asarray(resume_emb).reshape(1, -1))[0]
+    return dict(zip(jds, jd_vectors(jds, jd_embeddings) @ query))
+
+def section_semantic_scores(resume_text, jds):
+    """
+    Per-section semantic similarity against each JD, reusing the section
+    vectors produced by chunked embedding (no extra encoder calls when the
+    resume was already scored in "chunked" mode).
+    
+    Returns:
+        dict: {domain: {section: similarity}}
+    """
+    if isinstance(resume_text, ParsedResume):
+        resume_text = resume_text.text
+    _, section_vecs = fe.get_chunked_embedding(resume_text)
+    scores = {domain: {} for domain in jds}
+    jd_index.refresh()
+    for section, vec in section_vecs.items():
+        for domain, sim in semantic_similarities(vec, jds, refresh=False).items():
+            scores[domain][section] = round(float(sim), 2)
+    return scores
+
+def score_all_domains(resume_text, jds, embedding_mode=None, sections=None):
+    """
+    Scores one resume against every domain in a single pass.
+    
+    The resume is parsed (sections, fresher flag, skills) and embedded once
+    and compared with every JD through the persisted JD embedding index in a
+    single matrix product; only the classifier step and the JD's own skill
+    list are per domain.
+    
+    Args:
+        resume_text (str or ParsedResume): Extracted text of the resume.
+        jds (dict): {domain: jd_text}
+        embedding_mode (str): "full" or "chunked" (default: EMBEDDING_MODE).
+        sections (dict): extract_sections output if already known (e.g. cached).
+        
+    Returns:
+        dict: {domain: (score, match_level, missing_skills, sections, is_fresher)},
+              the same tuples calculate_composite_score returns.
+    """
+    if not jds:
+        return {}
+    domains = list(jds.keys())
+    
+    # Shared, domain-independent work
+    resume = parse_resume(resume_text, sections)
+    sections, is_fresher = resume.sections, resume.is_fresher
+    # Lemmatize everything the domain models will see in one spaCy batch;
+    # their TF-IDF steps then read it back from preprocess_cache
+    if LEMMATIZE and not resume.mark_preprocessed():
+        preprocess_texts(resume.model_rows()[1])
+    resume_emb = get_resume_embedding(resume, embedding_mode)
+    semantic_sims = semantic_similarities(resume_emb, jds)
+    
+    # Per-domain classifier fan-out
+    results = {}
+    for domain in domains:
+        semantic_sim = semantic_sims[domain]
+        model = get_model(domain)
+        if model is None:
+            results[domain] = (0, "Model not trained", [], {}, False)
+            continue
+        ml_proba, section_probs = predict_probas(model, resume, sections)
+        weighted_result = calculate_weighted_score(sections, domain, section_probs)
+        
+        final_score = combine_scores(ml_proba, semantic_sim, weighted_result)
+        missing_skills = get_missing_skills(resume, jds[domain])
+        results[domain] = (final_score, get_match_level(final_score), missing_skills, sections, is_fresher)
+        
+    return results
+
+def score_batch(resume_texts, jds, embedding_mode=None, sections_list=None, jd_embeddings=None):
+    """
+    Scores several resumes against every domain at once, for callers that
+    coalesce concurrent requests (see src.scoring_service).
+    
+    All resumes are embedded with one encoder call and each domain model
+    runs a single predict_proba over the rows of every resume in the batch.
+    
+    Args:
+        resume_texts (list): Extracted resume texts or ParsedResume objects.
+        jds (dict): {domain: jd_text}
+        embedding_mode (str): "full" or "chunked" (default: EMBEDDING_MODE).
+        sections_list (list): extract_sections output per resume, if already known.
+        jd_embeddings (dict): {domain: vector} for JDs not in the JD index,
+            if already encoded.
+        
+    Returns:
+        list: One score_all_domains-style dict per resume, in input order.
+    """
+    resume_texts = list(resume_texts)
+    if not resume_texts or not jds:
+        return [{} for _ in resume_texts]
+    if sections_list is None:
+        sections_list = [None] * len(resume_texts)
+    resumes = [parse_resume(text, sections) for text, sections in zip(resume_texts, sections_list)]
+        
+    rows = [resume.model_rows() for resume in resumes]
+    names = [name for row_names, _ in rows for name in row_names]
+    texts = [text for _, row_texts in rows for text in row_texts]
+    if LEMMATIZE:
+        preprocess_texts([text for resume, (_, row_texts) in zip(resumes, rows)
+                          if not resume.mark_preprocessed() for text in row_texts])
+    
+    embedding_mode = embedding_mode or EMBEDDING_MODE
+    if embedding_mode == "full":
+        # One encoder call for every resume not embedded yet
+        pending = [resume for resume in resumes if embedding_mode not in resume.embeddings]
+        if pending:
+            for resume, embedding in zip(pending, fe.get_sbert_embeddings([r.text for r in pending])):
+                resume.embeddings[embedding_mode] = embedding
+    embeddings = [get_resume_embedding(resume, embedding_mode) for resume in resumes]
+    # Every resume against every JD in one matrix product; JDs are looked up or encoded once
+    jd_index.refresh()
+    sim_matrix = _normalize_rows(np.vstack(embeddings)) @ jd_vectors(jds, jd_embeddings).T
+    semantic_sims = [dict(zip(jds, row)) for row in sim_matrix]
+    
+    results = [{} for _ in resumes]
+    for domain, jd_text in jds.items():
+        model = get_model(domain)
+        if model is None:
+            for result in results:
+                result[domain] = (0, "Model not trained", [], {}, False)
+            continue
+        probas = _predict_rows(model, names, texts)
+        offset = 0
+        for i, (row_names, row_texts) in enumerate(rows):
+            section_probs = dict(zip(row_names, probas[offset:offset + len(row_texts)]))
+            offset += len(row_texts)
+            ml_proba = section_probs.pop(None)
+            resume = resumes[i]
+            weighted_result = calculate_weighted_score(resume.sections, domain, section_probs)
+            
+            final_score = combine_scores(ml_proba, semantic_sims[i][domain], weighted_result)
+            missing_skills = get_missing_skills(resume, jd_text)
+            results[i][domain] = (final_score, get_match_level(final_score), missing_skills,
+                                  resume.sections, resume.is_fresher)
+            
+    return results
 
 if __name__ == "__main__":
     # Test
@@ -0,0 +1,283 @@
+"""
+Asynchronous HTTP scoring service for ATS integrations.
+
+Usage:
+    python -m src.scoring_service --port 8080 --max-batch-size 16 --max-wait-ms 10
+
+Endpoints:
+    POST /score?filename=cv.pdf[&domain=Data_Scientist]
+        Body: the raw resume file (PDF, DOCX or TXT). The filename (query
+        parameter or X-Filename header) selects the format. Returns the
+        calculate_composite_score fields for one domain, or for every
+        domain when no domain is given.
+    GET /health
+        Liveness check with batching counters.
+
+Concurrent requests are coalesced into micro-batches: a batch is flushed
+when it reaches max_batch_size or max_wait seconds after its first request,
+and is scored with one encoder call and one predict_proba per domain
+(src.scoring.score_batch). Text extraction and scoring run in executors so
+the event loop only handles I/O.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from src.data_loader import load_jds, JD_DIR
+
+DEFAULT_MAX_BATCH_SIZE = 16
+DEFAULT_MAX_WAIT = 0.01
+# Uploads larger than this are rejected with 413
+MAX_BODY_BYTES = 20 * 1024 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+class MicroBatcher:
+    """
+    Collects items submitted concurrently and hands them to `process_batch`
+    (a blocking function taking a list and returning a list of results in
+    the same order) in batches, run on `executor`.
+    """
+    def __init__(self, process_batch, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT, executor=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        # One scoring thread: batches run back to back and the models are never shared across threads
+        self.executor = executor or ThreadPoolExecutor(max_workers=1)
+        self._queue = None
+        self._task = None
+        self.batches = 0
+        self.items = 0
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=False)
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.process_batch, items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+def _to_json(domain_result):
+    score, match_level, missing_skills, sections, is_fresher = domain_result
+    return {
+        "score": float(score),
+        "match_level": match_level,
+        "missing_skills": list(missing_skills),
+        "sections": sections,
+        "is_fresher": bool(is_fresher)
+    }
+
+class ScoringService:
+    """
+    Scores uploaded resumes against a fixed set of JDs, micro-batching
+    concurrent requests.
+    """
+    def __init__(self, jds, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT, extract_workers=None):
+        self.jds = jds
+        self.batcher = MicroBatcher(self._score, max_batch_size, max_wait)
+        self.extract_executor = ThreadPoolExecutor(max_workers=extract_workers or min(8, os.cpu_count() or 1))
+        self.requests = 0
+
+    def warm(self):
+        """
+        Loads models, spaCy, the encoder and the JD index before serving.
+        """
+        import src.data_loader
+        from src.scoring import warmup
+        # Uploads are already extracted concurrently on extract_executor; a
+        # process pool per large PDF on top of that would oversubscribe the CPUs
+        src.data_loader.PDF_WORKERS = 1
+        warmup(self.jds.keys())
+
+    def _score(self, items):
+        from src.scoring import score_batch
+        texts = [text for text, _ in items]
+        sections_list = [sections for _, sections in items]
+        return score_batch(texts, self.jds, sections_list=sections_list)
+
+    @staticmethod
+    def _extract(data, filename):
+        from src.data_loader import load_resume
+        from src.extraction_cache import extraction_cache
+        from src.section_extraction import extract_sections
+        def extract():
+            text = load_resume(data, filename)
+            return text, extract_sections(text) if text else {}
+        text, sections, _ = extraction_cache.get_or_extract(data, extract)
+        return text, sections
+
+    async def score(self, data, filename, domain=None):
+        """
+        Returns (status, payload) for one uploaded resume.
+        """
+        if domain is not None and domain not in self.jds:
+            return 404, {"error": f"Unknown domain: {domain}"}
+        loop = asyncio.get_running_loop()
+        text, sections = await loop.run_in_executor(self.extract_executor, self._extract, data, filename)
+        if not text:
+            return 422, {"error": "Text extraction failed"}
+        results = await self.batcher.submit((text, sections))
+        if domain is not None:
+            return 200, dict(domain=domain, **_to_json(results[domain]))
+        return 200, {"results": {d: _to_json(r) for d, r in results.items()}}
+
+    async def handle(self, method, target, headers, body):
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/health":
+            return 200, {"status": "ok", "domains": list(self.jds.keys()), "requests": self.requests,
+                         "batches": self.batcher.batches, "batched_items": self.batcher.items}
+        if url.path != "/score":
+            return 404, {"error": "Not found"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+        filename = params.get("filename") or headers.get("x-filename")
+        if not filename:
+            return 400, {"error": "Pass the resume filename as ?filename= or an X-Filename header"}
+        self.requests += 1
+        return await self.score(body, filename, params.get("domain"))
+
+    async def serve_connection(self, reader, writer):
+        # Minimal HTTP/1.1 with keep-alive; one request at a time per connection
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, _ = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Resume too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = await self.handle(method, target, headers, body)
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+async def serve(service, host="127.0.0.1", port=8080):
+    service.batcher.start()
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    print(f"Scoring service listening on http://{host}:{port} ({len(service.jds)} roles, "
+          f"max batch {service.batcher.max_batch_size}, max wait {service.batcher.max_wait * 1000:.0f} ms)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.batcher.stop()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume scoring over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--domains", nargs="+", help="Roles to score against (default: all job descriptions)")
+    parser.add_argument("--jd-dir", default=JD_DIR, help="Directory of job description .txt files")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE, help="Max resumes scored per batch")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT * 1000,
+                        help="Max time a request waits for its batch to fill")
+    parser.add_argument("--extract-workers", type=int, default=None, help="Threads for text extraction")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    jds = load_jds(args.jd_dir, args.domains)
+    if not jds:
+        print("No Job Descriptions found!")
+        return 1
+    service = ScoringService(jds, args.max_batch_size, args.max_wait_ms / 1000, args.extract_workers)
+    print("Loading models...")
+    service.warm()
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,111 +1,158 @@
 import re
 
-def extract_sections(resume_text):
+# Bump whenever extract_sections can return something different for the same
+# text; cached sections (src.extraction_cache) are keyed on it
+PARSER_VERSION = 1
+
+# Text sections returned by extract_sections (besides the 'is_fresher' flag)
+SECTION_NAMES = ("skills", "experience", "projects", "education", "certifications")
+
+# Heading variants per section, in the order they are tried at a position
+HEADING_PATTERNS = {
+    "skills": r"skills|technical skills|core competencies|expertise",
+    "experience": r"experience|work experience|professional experience|employment history",
+    "projects": r"projects|academic projects|personal projects",
+    "education": r"education|academic background|qualification",
+    "certifications": r"certifications|certificates|licenses"
+}
+# Criterion A: keywords "fresher", "student", "recent graduate"
+FRESHER_PATTERN = r"fresher|student|recent graduate"
+# Criterion B: numeric experience (e.g. "1 year", "2 years", "3 yrs")
+DURATION_PATTERN = r"\d+\s*(?:years?|yrs?)"
+
+# Every heading and fresher signal in one alternation, so a resume is
+# scanned once. None of the alternatives can overlap another group's, so
+# this finds exactly what one scan per pattern would.
+_SCAN_RE = re.compile(
+    r"\b(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in HEADING_PATTERNS.items())
+    + f"|(?P<fresher>{FRESHER_PATTERN})|(?P<duration>{DURATION_PATTERN}))\\b"
+)
+
+class SectionSpans:
     """
-    Extracts logical sections from resume text and detects if the candidate is a fresher.
-    
+    Section layout of a resume as offsets into its lowercased text.
+
+    `spans[section]` lists the (start, end) of each body found for that
+    section, in document order (a body runs from the line after its heading
+    to the next heading, whitespace-stripped). `unsectioned` lists the
+    non-empty text outside every body, minus the heading words: the preamble
+    before the first heading (name, summary, objective) and anything on a
+    heading's own line. Section text is only materialized when asked for, so
+    callers that just need offsets can slice `text` themselves.
+    """
+    __slots__ = ("text", "spans", "unsectioned", "headings", "is_fresher", "_texts")
+
+    def __init__(self, text, spans, headings, is_fresher, unsectioned=()):
+        self.text = text
+        self.spans = spans
+        self.unsectioned = list(unsectioned)
+        self.headings = headings
+        self.is_fresher = is_fresher
+        self._texts = {}
+
+    def __getitem__(self, section):
+        if section == "is_fresher":
+            return self.is_fresher
+        value = self._texts.get(section)
+        if value is None:
+            value = ""
+            for start, end in self.spans[section]:
+                # Repeated headings are joined with newlines; empty bodies
+                # before the first non-empty one are dropped
+                body = self.text[start:end]
+                value = value + "\n" + body if value else body
+            self._texts[section] = value
+        return value
+
+    def get(self, section, default=None):
+        if section == "is_fresher" or section in self.spans:
+            return self[section]
+        return default
+
+    def unsectioned_text(self):
+        """
+        Text the sections don't cover (see `unsectioned`), one piece per line.
+        """
+        return "\n".join(self.text[start:end] for start, end in self.unsectioned)
+
+    def to_dict(self):
+        """
+        The extract_sections dictionary.
+        """
+        result = {section: self[section] for section in SECTION_NAMES}
+        result["is_fresher"] = self.is_fresher
+        return result
+
+def _strip_span(text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+def find_sections(resume_text):
+    """
+    Scans a resume once for section headings and fresher signals.
+
     Args:
         resume_text (str): The raw text of the resume.
-        
+
     Returns:
-        dict: A dictionary containing extracted text for 'skills', 'experience', 'projects',
-              'education', 'certifications', and a boolean 'is_fresher'.
+        SectionSpans
     """
-    
-    # 1. Convert to lowercase for case-insensitive matching
+    # Offsets refer to the lowercased text (lowercasing can change the length)
     text = resume_text.lower()
-    
-    # 2. Define regex patterns for headings
-    # Using specific variants as requested
-    patterns = {
-        "skills": r"\b(skills|technical skills|core competencies|expertise)\b",
-        "experience": r"\b(experience|work experience|professional experience|employment history)\b",
-        "projects": r"\b(projects|academic projects|personal projects)\b",
-        "education": r"\b(education|academic background|qualification)\b",
-        "certifications": r"\b(certifications|certificates|licenses)\b"
-    }
-    
-    # Initialize output dictionary
-    extracted_sections = {
-        "skills": "",
-        "experience": "",
-        "projects": "",
-        "education": "",
-        "certifications": "",
-        "is_fresher": False
-    }
-    
-    # 3. Search for headings and their positions
-    matches = []
-    for section, pattern in patterns.items():
-        for match in re.finditer(pattern, text):
-            matches.append((match.start(), section))
-            
-    # Sort matches by position to process sections in order
-    matches.sort()
-    
-    # 4. Capture text until next heading
-    for i in range(len(matches)):
-        start_pos, section_name = matches[i]
-        
-        # Determine the end position (start of next section or end of text)
-        if i + 1 < len(matches):
-            end_pos = matches[i+1][0]
+    headings = []
+    heading_ends = []
+    has_fresher_keyword = False
+    has_duration = False
+    for match in _SCAN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "fresher":
+            has_fresher_keyword = True
+        elif kind == "duration":
+            has_duration = True
         else:
-            end_pos = len(text)
-            
-        # Extract content
-        content = text[start_pos:end_pos]
-        
-        # Remove the heading itself from the content 
-        # (This is a simple cleaner: split by first newline or just regex sub slightly safer?)
-        # Let's simple split by newline if present, or just remove the matched pattern string.
-        # However, to be robust to the User's "Search for headings... capture text", 
-        # usually we want the *body* of the section.
-        # Let's remove the first line which contains the header.
-        lines = content.split('\n', 1)
-        if len(lines) > 1:
-            section_content = lines[1].strip()
-        else:
-            section_content = "" # Or maybe the header was inline? Let's assume header is on its own line usually.
-            # If split failed (no newline), we might want to strip the specific matched word.
-            # Re-matching specifically at start might be overkill but let's try to just strip.
-            # For this simple implementation, if no newline, we might return empty or full line minus header.
-            # Let's keep it simple: just strip whitespace.
-            pass
-            
-        # Append to the section (handling duplicate headers if any, though usually one main block)
-        # Verify if we should overwrite or append. "Store captured text in a dictionary". 
-        # Appending is safer for split sections.
-        current_val = extracted_sections[section_name]
-        if current_val:
-            extracted_sections[section_name] = current_val + "\n" + section_content
+            headings.append((match.start(), kind))
+            heading_ends.append(match.end())
+
+    spans = {section: [] for section in SECTION_NAMES}
+    unsectioned = [_strip_span(text, 0, headings[0][0] if headings else len(text))]
+    for i, (start, section) in enumerate(headings):
+        end = headings[i + 1][0] if i + 1 < len(headings) else len(text)
+        # The heading's own line is dropped; a heading with no newline after it has no body
+        newline = text.find("\n", start, end)
+        if newline == -1:
+            spans[section].append((end, end))
         else:
-            extracted_sections[section_name] = section_content
+            spans[section].append(_strip_span(text, newline + 1, end))
+        # Whatever shares the heading's line is kept as unsectioned text
+        unsectioned.append(_strip_span(text, heading_ends[i], end if newline == -1 else newline))
+    unsectioned = [(s, e) for s, e in unsectioned if s < e]
 
-    # 5. Fresher Detection Logic
-    # Criterion A: Resume contains keywords "fresher", "student", "recent graduate"
-    fresher_keywords = r"\b(fresher|student|recent graduate)\b"
-    is_fresher_by_keyword = bool(re.search(fresher_keywords, text))
-    
-    # Criterion B: No numeric experience detected (e.g. "1 year", "2 years", "3 yrs")
-    # Regex for year duration
-    experience_duration_pattern = r"\b\d+\s*(years?|yrs?)\b"
-    has_experience_duration = bool(re.search(experience_duration_pattern, text))
-    
     # Mark as fresher if keyword found OR no experience duration found
-    if is_fresher_by_keyword or not has_experience_duration:
-        extracted_sections["is_fresher"] = True
-    else:
-        extracted_sections["is_fresher"] = False
+    is_fresher = has_fresher_keyword or not has_duration
+    return SectionSpans(text, spans, headings, is_fresher, unsectioned)
+
+def extract_sections(resume_text):
+    """
+    Extracts logical sections from resume text and detects if the candidate is a fresher.
+    
+    Args:
+        resume_text (str): The raw text of the resume.
         
-    return extracted_sections
+    Returns:
+        dict: A dictionary containing extracted text for 'skills', 'experience', 'projects',
+              'education', 'certifications', and a boolean 'is_fresher'.
+    """
+    return find_sections(resume_text).to_dict()
 
 if __name__ == "__main__":
     # Small test example
     sample_resume = """
     John Doe
     Recent Graduate
+    Summary: Aspiring data scientist with a focus on NLP.
     
     Technical Skills
     Python, SQL, Machine Learning, NLP
@@ -127,3 +174,5 @@ if __name__ == "__main__":
         print(f"{key.upper()}: {value}")
         
     print(f"\nIS FRESHER: {result['is_fresher']}")
+    # Preamble and heading-line text, which the chunked embedding also encodes
+    print(f"UNSECTIONED: {find_sections(sample_resume).unsectioned_text()!r}")
@@ -1,20 +1,13 @@
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 from functools import lru_cache
-
-# Global cache for the model to ensure it's loaded only once
-_model = None
+from src.encoder import get_encoder
 
 def get_model():
     """
-    Singleton pattern to load the Sentence Transformer model.
+    Returns the process-wide Sentence Transformer model (shared with
+    feature_engineering through src.encoder).
     """
-    global _model
-    if _model is None:
-        # Using the lightweight model as requested
-        _model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-    return _model
+    return get_encoder().model
 
 @lru_cache(maxsize=128)
 def get_embedding(text):
@@ -22,9 +15,7 @@ def get_embedding(text):
     Generates and caches embedding for a given text.
     LRU Cache ensures we don't re-compute for same resumes/JDs.
     """
-    model = get_model()
-    # model.encode returns a numpy array
-    return model.encode([text])[0]
+    return get_encoder().encode(text)
 
 def calculate_semantic_similarity(resume_text, jd_text):
     """
@@ -51,6 +42,7 @@ def calculate_semantic_similarity(resume_text, jd_text):
         
         # 3. Compute Cosine Similarity
         # Returns [[score]]
+        from sklearn.metrics.pairwise import cosine_similarity
         similarity = cosine_similarity(resume_emb, jd_emb)[0][0]
         
         # Ensure it's not negative (though usually 0-1 for SBERT)
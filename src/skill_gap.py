@@ -1,7 +1,10 @@
-import re
+from src.skill_matcher import SkillMatcher
+from src.skill_taxonomy import get_skill_index
+from src.parsed_resume import ParsedResume
 
-# Master list of common technical and professional skills
-# In a real production system, this would be a large database or external file.
+# Built-in fallback list of common technical and professional skills.
+# The live list is the taxonomy in data/skills_taxonomy.json (with aliases and
+# categories), compiled to a memory-mapped index by src.skill_taxonomy.
 MASTER_SKILLS_DB = {
     # Programming Languages
     "python", "java", "c++", "c#", "javascript", "typescript", "scala", "r", "go", "swift", "kotlin",
@@ -28,39 +31,49 @@ MASTER_SKILLS_DB = {
     "critical thinking", "time management", "sales", "marketing", "strategic planning"
 }
 
+# Only used when no taxonomy file is available
+_fallback_matcher = SkillMatcher(MASTER_SKILLS_DB)
+
+def get_skill_matcher():
+    """
+    Returns the compiled taxonomy index (reloaded automatically when the
+    taxonomy file changes), or the built-in matcher if there is none.
+    """
+    index = get_skill_index()
+    return index if index is not None else _fallback_matcher
+
 def extract_skills(text):
     """
-    Extracts known skills from text using simple keyword matching against the master DB.
+    Extracts known skills from text using keyword matching against the skills taxonomy.
+    Aliases are reported under their canonical name (e.g. "sklearn" -> "scikit-learn").
     
     Args:
-        text (str): Input text data (Resume or JD).
+        text (str or ParsedResume): Input text data (Resume or JD). A
+            ParsedResume's skill set is extracted once and reused.
         
     Returns:
         set: A set of extracted skills (lowercase).
     """
-    # 1. Clean and lowercase text
-    text = text.lower()
-    found_skills = set()
-    
-    # 2. Check for each skill in the text
-    # This is a basic O(N*M) approach. For large DBs, use Aho-Corasick or Regex.
-    for skill in MASTER_SKILLS_DB:
-        # Regex boundary check to avoid partial matches (e.g., "java" in "javascript")
-        # specific handling for c++ or c# to avoid regex errors
-        escaped_skill = re.escape(skill)
-        pattern = r'\b' + escaped_skill + r'\b'
-        
-        if re.search(pattern, text):
-            found_skills.add(skill)
-            
-    return found_skills
+    if isinstance(text, ParsedResume):
+        return text.skills
+    # Single pass over the text; whole-token matches only, e.g. "java" is not found in "javascript"
+    return get_skill_matcher().extract(text.lower())
+
+def extract_skill_matches(text):
+    """
+    Like extract_skills, but returns every occurrence with its position.
+    
+    Returns:
+        list: (start, end, skill) tuples; offsets index into text.lower().
+    """
+    return get_skill_matcher().find_all(text.lower())
 
 def get_missing_skills(resume_text, jd_text):
     """
     Identifies skills present in JD but missing in Resume.
     
     Args:
-        resume_text (str): Resume content.
+        resume_text (str or ParsedResume): Resume content.
         jd_text (str): Job Description content.
         
     Returns:
@@ -0,0 +1,130 @@
+from collections import deque
+
+def _is_word_char(ch):
+    # Same notion of a word character as regex \w
+    return ch.isalnum() or ch == '_'
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skills dictionary.
+
+    Built once, it finds every dictionary entry in a document with a single
+    left-to-right scan, however many entries there are, instead of running
+    one regex per skill.
+
+    Matches respect token boundaries the way `\\b<skill>\\b` is meant to: a
+    skill that starts (ends) with a word character must not be preceded
+    (followed) by one. Edges that are symbols, as in "c++" or "c#", impose no
+    constraint, so "c++ developer" matches "c++" (the old regex needed a word
+    character after the "+" for its trailing \\b to hold).
+
+    Args:
+        skills (iterable): Skill strings; matching is case-sensitive, so pass
+            them (and the texts) lowercased.
+    """
+    def __init__(self, skills):
+        self.patterns = list(dict.fromkeys(skills))
+        self._starts_word = [bool(p) and _is_word_char(p[0]) for p in self.patterns]
+        self._ends_word = [bool(p) and _is_word_char(p[-1]) for p in self.patterns]
+        self._build()
+
+    def _build(self):
+        goto = [{}]
+        out = [[]]
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(index)
+
+        # Breadth-first pass for failure links; each node's output list is
+        # extended with its failure node's so the scan never walks the chain
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                out[child].extend(out[fail[child]])
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def export(self):
+        """
+        Flattens the automaton into plain int lists, for serialization by
+        src.skill_taxonomy. Edges are stored CSR-style and sorted by code point
+        within each node so they can be binary-searched.
+        """
+        edge_start, edge_char, edge_target = [0], [], []
+        for edges in self._goto:
+            for ch, target in sorted(edges.items()):
+                edge_char.append(ord(ch))
+                edge_target.append(target)
+            edge_start.append(len(edge_char))
+        out_start, out_pattern = [0], []
+        for outputs in self._out:
+            out_pattern.extend(outputs)
+            out_start.append(len(out_pattern))
+        return {
+            "edge_start": edge_start,
+            "edge_char": edge_char,
+            "edge_target": edge_target,
+            "fail": list(self._fail),
+            "out_start": out_start,
+            "out_pattern": out_pattern,
+            "pattern_len": [len(p) for p in self.patterns],
+            "pattern_flags": [int(s) | (int(e) << 1) for s, e in zip(self._starts_word, self._ends_word)]
+        }
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def finditer(self, text):
+        """
+        Yields (start, end, skill) for every match in text, in order of end offset.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        patterns = self.patterns
+        n = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            for index in out[node]:
+                pattern = patterns[index]
+                start = end - len(pattern)
+                if self._starts_word[index] and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if self._ends_word[index] and end < n and _is_word_char(text[end]):
+                    continue
+                yield start, end, pattern
+
+    def find_all(self, text):
+        """
+        Returns a list of (start, end, skill) matches.
+        """
+        return list(self.finditer(text))
+
+    def extract(self, text):
+        """
+        Returns the set of skills found in text.
+        """
+        return {skill for _, _, skill in self.finditer(text)}
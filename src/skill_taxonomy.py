@@ -0,0 +1,267 @@
+import os
+import sys
+import json
+import mmap
+import array
+import struct
+import threading
+from bisect import bisect_left
+
+from src.skill_matcher import SkillMatcher, _is_word_char
+
+TAXONOMY_PATH = "data/skills_taxonomy.json"
+INDEX_PATH = "models/skills_taxonomy.idx"
+
+# Binary index layout (native byte order, recorded in the header):
+#   header: magic, format version, byte order, source mtime_ns, source size,
+#           lengths of the int32 arrays below, length of the JSON metadata
+#   int32 arrays in ARRAYS order, then the UTF-8 JSON metadata
+MAGIC = b"SKIX"
+FORMAT_VERSION = 1
+ARRAYS = ("edge_start", "edge_char", "edge_target", "fail", "out_start", "out_pattern",
+          "pattern_len", "pattern_flags", "pattern_skill")
+# (padded so the int32 arrays that follow start 4-byte aligned)
+_HEADER = struct.Struct("<4sIB3xqq" + "I" * len(ARRAYS) + "I")
+_BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    """
+    Reads a skills taxonomy file.
+
+    The file is JSON of the form
+        {"categories": {"<category>": ["<skill>", {"name": "<skill>", "aliases": [...]}, ...]}}
+
+    Returns:
+        list: (skill, category, aliases) tuples, lowercased.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    entries = []
+    for category, items in data.get("categories", {}).items():
+        for item in items:
+            if isinstance(item, str):
+                name, aliases = item, []
+            else:
+                name, aliases = item["name"], item.get("aliases", [])
+            entries.append((name.strip().lower(), category, [a.strip().lower() for a in aliases]))
+    return entries
+
+def build_index_bytes(entries, source_stat=None):
+    """
+    Compiles taxonomy entries into the binary index format.
+    Every skill name and alias becomes a pattern that resolves to its canonical skill.
+    """
+    skills, categories, pattern_skill = [], [], {}
+    for name, category, aliases in entries:
+        if name in pattern_skill:
+            continue
+        skill_id = len(skills)
+        skills.append(name)
+        categories.append(category)
+        for surface in [name] + aliases:
+            # First definition wins if two skills claim the same alias
+            pattern_skill.setdefault(surface, skill_id)
+
+    matcher = SkillMatcher(pattern_skill.keys())
+    arrays = matcher.export()
+    arrays["pattern_skill"] = [pattern_skill[p] for p in matcher.patterns]
+
+    meta = json.dumps({
+        "skills": skills,
+        "categories": categories,
+        "patterns": matcher.patterns
+    }).encode('utf-8')
+    mtime_ns, size = (source_stat.st_mtime_ns, source_stat.st_size) if source_stat else (0, 0)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, _BYTE_ORDER, mtime_ns, size,
+                          *[len(arrays[name]) for name in ARRAYS], len(meta))
+    body = b"".join(array.array('i', arrays[name]).tobytes() for name in ARRAYS)
+    return header + body + meta
+
+def _write_index(data, index_path):
+    # Atomic replace, so concurrent readers see either the old or the new index
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, index_path)
+
+def compile_taxonomy(source_path=TAXONOMY_PATH, index_path=INDEX_PATH):
+    """
+    Compiles the taxonomy file to a binary index and returns the bytes.
+    """
+    data = build_index_bytes(load_taxonomy(source_path), os.stat(source_path))
+    _write_index(data, index_path)
+    return data
+
+class SkillIndex:
+    """
+    Read-only view over a compiled taxonomy index.
+
+    The automaton arrays are used in place from the buffer (normally a
+    memory-mapped file), so opening an index costs a header parse regardless
+    of taxonomy size; the JSON metadata (skill names, aliases) is decoded on
+    first use. The scan has the same token-boundary rules as SkillMatcher.
+    """
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        fields = _HEADER.unpack_from(view, 0)
+        magic, version, byte_order, self.source_mtime_ns, self.source_size = fields[:5]
+        if magic != MAGIC or version != FORMAT_VERSION or byte_order != _BYTE_ORDER:
+            raise ValueError("Incompatible skills index")
+        lengths, meta_len = fields[5:-1], fields[-1]
+
+        offset = _HEADER.size
+        for name, length in zip(ARRAYS, lengths):
+            end = offset + 4 * length
+            setattr(self, "_" + name, view[offset:end].cast('i'))
+            offset = end
+        self._meta_view = view[offset:offset + meta_len]
+        self._meta = None
+        self._buffer = buffer
+
+        # Transitions out of the root are by far the most frequent lookups
+        lo, hi = self._edge_start[0], self._edge_start[1]
+        self._root = {chr(self._edge_char[j]): self._edge_target[j] for j in range(lo, hi)}
+
+    @classmethod
+    def open(cls, path):
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    @property
+    def meta(self):
+        if self._meta is None:
+            meta = json.loads(bytes(self._meta_view).decode('utf-8'))
+            meta["aliases"] = {p: meta["skills"][s] for p, s in zip(meta["patterns"], self._pattern_skill)}
+            self._meta = meta
+        return self._meta
+
+    @property
+    def skills(self):
+        return self.meta["skills"]
+
+    def __len__(self):
+        return len(self._pattern_len)
+
+    def canonicalize(self, name):
+        """
+        Maps a skill name or alias (any case) to its canonical skill, or None.
+        """
+        return self.meta["aliases"].get(name.strip().lower())
+
+    def category(self, skill):
+        meta = self.meta
+        canonical = self.canonicalize(skill)
+        if canonical is None:
+            return None
+        return meta["categories"][meta["skills"].index(canonical)]
+
+    def finditer(self, text):
+        """
+        Yields (start, end, skill) for every match in text, with the skill in
+        canonical form (so "sklearn" yields "scikit-learn").
+        """
+        edge_start, edge_char, edge_target = self._edge_start, self._edge_char, self._edge_target
+        fail, out_start, out_pattern = self._fail, self._out_start, self._out_pattern
+        pattern_len, pattern_flags, pattern_skill = self._pattern_len, self._pattern_flags, self._pattern_skill
+        root = self._root
+        skills = None
+        n = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while True:
+                if node == 0:
+                    node = root.get(ch, 0)
+                    break
+                lo, hi = edge_start[node], edge_start[node + 1]
+                j = bisect_left(edge_char, ord(ch), lo, hi)
+                if j < hi and edge_char[j] == ord(ch):
+                    node = edge_target[j]
+                    break
+                node = fail[node]
+
+            lo, hi = out_start[node], out_start[node + 1]
+            if lo == hi:
+                continue
+            end = i + 1
+            for k in range(lo, hi):
+                p = out_pattern[k]
+                start = end - pattern_len[p]
+                flags = pattern_flags[p]
+                if flags & 1 and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if flags & 2 and end < n and _is_word_char(text[end]):
+                    continue
+                if skills is None:
+                    skills = self.skills
+                yield start, end, skills[pattern_skill[p]]
+
+    def find_all(self, text):
+        return list(self.finditer(text))
+
+    def extract(self, text):
+        return {skill for _, _, skill in self.finditer(text)}
+
+_indexes = {} # (source_path, index_path) -> (index file stamp, SkillIndex)
+_lock = threading.Lock()
+
+def _stamp(stat):
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+def get_skill_index(source_path=TAXONOMY_PATH, index_path=INDEX_PATH):
+    """
+    Returns the SkillIndex for a taxonomy, compiling it if the index is
+    missing or older than the source file and re-mapping it whenever the
+    index file is replaced. Cheap to call per request (two stat calls).
+
+    Returns None if neither the taxonomy nor a compiled index exists.
+    """
+    key = (source_path, index_path)
+    try:
+        source_stat = os.stat(source_path)
+    except OSError:
+        source_stat = None
+    try:
+        index_stamp = _stamp(os.stat(index_path))
+    except OSError:
+        index_stamp = None
+
+    cached = _indexes.get(key)
+    if cached is not None and cached[0] == index_stamp and not _is_stale(cached[1], source_stat):
+        return cached[1]
+
+    with _lock:
+        index = None
+        if index_stamp is not None:
+            try:
+                index = SkillIndex.open(index_path)
+            except (OSError, ValueError):
+                index = None
+        if source_stat is not None and (index is None or _is_stale(index, source_stat)):
+            try:
+                data = build_index_bytes(load_taxonomy(source_path), source_stat)
+            except (OSError, ValueError, KeyError) as e:
+                # Keep serving the last good index while the file is being edited
+                print(f"Could not load skills taxonomy {source_path}: {e}")
+                return cached[1] if cached is not None else index
+            try:
+                _write_index(data, index_path)
+                index = SkillIndex.open(index_path)
+            except OSError as e:
+                # Read-only deployment (or index file locked): serve from memory
+                print(f"Could not write skills index {index_path}: {e}")
+                index = SkillIndex(data)
+        if index is None:
+            return None
+        try:
+            index_stamp = _stamp(os.stat(index_path))
+        except OSError:
+            index_stamp = None
+        _indexes[key] = (index_stamp, index)
+        return index
+
+def _is_stale(index, source_stat):
+    if source_stat is None:
+        return False
+    return (index.source_mtime_ns, index.source_size) != (source_stat.st_mtime_ns, source_stat.st_size)
@@ -0,0 +1,134 @@
+import os
+import time
+import pickle
+import random
+import threading
+import numpy as np
+
+from src.preprocessing import preprocess_text, preprocess_texts
+
+UNIFIED_MODEL_PATH = "models/unified_model.pkl"
+
+class UnifiedModel:
+    """
+    All domains in one model: a single TF-IDF vocabulary fitted on every
+    domain's synthetic resumes and a one-vs-rest head with one calibrated
+    Random Forest per domain.
+
+    A text is tokenized, lemmatized and vectorized once, however many roles
+    there are, and predict_proba_all returns every domain's probability.
+    Use view(domain) where a per-domain pipeline is expected.
+    """
+    def __init__(self, domains, vectorizer, head):
+        self.domains = list(domains)
+        self.vectorizer = vectorizer
+        self.head = head
+        self._index = {d: i for i, d in enumerate(self.domains)}
+        self._last = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_last"] = None
+        return state
+
+    def predict_proba_all(self, texts):
+        """
+        Returns an (n_texts, n_domains) array of Good Match probabilities.
+
+        The last result is remembered, so the per-domain views scoring the
+        same texts one domain after another share a single transform and predict.
+        """
+        key = tuple(texts)
+        last = self._last
+        if last is not None and last[0] == key:
+            return last[1]
+        probas = self.head.predict_proba(self.vectorizer.transform(key))
+        self._last = (key, probas)
+        return probas
+
+    def view(self, domain):
+        return DomainView(self, domain)
+
+class DomainView:
+    """
+    Per-domain face of a UnifiedModel with the predict_proba contract of the
+    per-domain pipelines ([P(no match), P(match)] per text).
+    """
+    def __init__(self, model, domain):
+        self.model = model
+        self.domain = domain
+        self.classes_ = np.array([0, 1])
+        self._column = model._index[domain]
+
+    def predict_proba(self, texts):
+        p = self.model.predict_proba_all(texts)[:, self._column]
+        return np.column_stack([1 - p, p])
+
+def build_unified_model(domains, n_jobs=None):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.multiclass import OneVsRestClassifier
+    base_rf = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
+    head = OneVsRestClassifier(CalibratedClassifierCV(base_rf, method='sigmoid'))
+    vectorizer = TfidfVectorizer(stop_words='english', preprocessor=preprocess_text)
+    return UnifiedModel(domains, vectorizer, head)
+
+def train_unified_model(all_jds_dict, n_samples=50, seed=None, path=UNIFIED_MODEL_PATH):
+    """
+    Trains and saves the unified model.
+
+    Each domain contributes n_samples perturbed copies of its JD, labeled
+    positive for that domain and negative for every other one.
+
+    Returns:
+        UnifiedModel
+    """
+    from src.model_training import perturb_text, _set_forest_n_jobs
+    start = time.perf_counter()
+    if seed is not None:
+        random.seed(seed)
+    domains = list(all_jds_dict.keys())
+    X_text, Y = [], []
+    for i, domain in enumerate(domains):
+        for _ in range(n_samples):
+            X_text.append(perturb_text(all_jds_dict[domain], noise_level=random.uniform(0.1, 0.4)))
+            labels = [0] * len(domains)
+            labels[i] = 1
+            Y.append(labels)
+
+    # One spaCy batch; the vectorizer then reads every text from preprocess_cache
+    preprocess_texts(X_text)
+    model = build_unified_model(domains, n_jobs=os.cpu_count())
+    features = model.vectorizer.fit_transform(X_text)
+    model.head.fit(features, np.array(Y))
+    for estimator in model.head.estimators_:
+        _set_forest_n_jobs(estimator, None)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+    print(f"Trained unified model for {len(domains)} domains "
+          f"({len(model.vectorizer.vocabulary_)} terms) in {time.perf_counter() - start:.1f}s")
+    return model
+
+_loaded = {} # path -> (mtime, UnifiedModel)
+_lock = threading.Lock()
+
+def load_unified_model(path=UNIFIED_MODEL_PATH):
+    """
+    Unpickles the unified model once per file version, so every domain view
+    shares the same object. Returns None if the file doesn't exist.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            model = pickle.load(f)
+        _loaded[path] = (mtime, model)
+        return model
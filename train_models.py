@@ -0,0 +1,56 @@
+"""
+Trains (or retrains) the domain models from data/job_descriptions.
+
+Usage:
+    python train_models.py
+    python train_models.py --domains Data_Scientist Data_Analyst --workers 2 --seed 42
+    python train_models.py --format unified   # serve with RESUME_MODEL_FORMAT=unified
+    python train_models.py --format compact   # serve with RESUME_MODEL_FORMAT=compact
+    python train_models.py --format linear    # serve with RESUME_MODEL_FORMAT=linear
+"""
+import sys
+import argparse
+
+from src.data_loader import load_jds, JD_DIR
+from src.model_training import train_all_models, export_compact_models, MODEL_FORMATS
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the per-role scoring models.")
+    parser.add_argument("--domains", nargs="+", help="Roles to (re)train (default: all job descriptions)")
+    parser.add_argument("--jd-dir", default=JD_DIR, help="Directory of job description .txt files")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per role, up to CPU count)")
+    parser.add_argument("--samples", type=int, default=50, help="Synthetic positive/negative resumes per role")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible synthetic data")
+    parser.add_argument("--format", choices=MODEL_FORMATS, default="per_domain",
+                        help="Per-domain pipelines, one unified model for all roles, per-domain "
+                             "pipelines exported to memory-mappable arrays, or fast linear pipelines")
+    args = parser.parse_args(argv)
+
+    # Negatives for each role are sampled from every other JD, so load them all
+    jds = load_jds(args.jd_dir)
+    if not jds:
+        print("No Job Descriptions found!")
+        return 1
+    unknown = set(args.domains or []) - set(jds)
+    if unknown:
+        print(f"Unknown roles: {', '.join(sorted(unknown))}")
+        return 1
+
+    if args.format == "unified":
+        from src.unified_model import train_unified_model
+        if args.domains:
+            jds = {d: jds[d] for d in args.domains}
+        train_unified_model(jds, args.samples, args.seed)
+        return 0
+
+    domains = args.domains or list(jds)
+    print(f"Training {len(domains)} models...")
+    model_format = "linear" if args.format == "linear" else "per_domain"
+    report = train_all_models(jds, domains, args.workers, args.samples, args.seed, model_format)
+    if args.format == "compact":
+        print(f"Exported compact models: {', '.join(export_compact_models(domains))}")
+    print(f"Done in {report['_total']['seconds']}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())